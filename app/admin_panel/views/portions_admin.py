@@ -1,11 +1,16 @@
 import asyncio
 
+from fastapi import Request
 from sqladmin import ModelView
 from sqlalchemy import select
 from sqlalchemy.orm import joinedload
+from app.core.cache_tags import CacheTagInvalidator, product_tag
+from app.core.cache_versions import bump_restaurant_versions
+from app.core.menu_read_model import rebuild_restaurant_menus
 from app.core.models.db_helper import db_helper
 from app.core.models.product_model import Product
 from app.core.models.product_size_model import Portion
+from app.core.negative_cache import PORTIONS, clear_missing
 
 
 class PortionAdmin(ModelView, model=Portion):
@@ -74,6 +79,22 @@ class PortionAdmin(ModelView, model=Portion):
     name_plural = "Порции продукта"
     icon = "fa fa-cutlery"
 
+    async def after_model_change(
+        self, data: dict, model: Portion, is_created: bool, request: Request
+    ) -> None:
+        """Вызывается после сохранения порции через админку: пересобираем меню"""
+        await rebuild_restaurant_menus(product_ids=[model.product_id])
+        CacheTagInvalidator.schedule(product_tag(model.product_id))
+        await bump_restaurant_versions(product_ids=[model.product_id])
+        if is_created:
+            await clear_missing(PORTIONS, model.product_id)
+
+    async def after_model_delete(self, model: Portion, request: Request) -> None:
+        """Вызывается после удаления порции через админку: пересобираем меню"""
+        await rebuild_restaurant_menus(product_ids=[model.product_id])
+        CacheTagInvalidator.schedule(product_tag(model.product_id))
+        await bump_restaurant_versions(product_ids=[model.product_id])
+
     @staticmethod
     async def _fetch_products():
         """Асинхронный метод для получения продуктов с ресторанами"""
@@ -1,11 +1,16 @@
-from fastapi import UploadFile
+from fastapi import UploadFile, Request
 from sqladmin import ModelView
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from wtforms import FileField
 from wtforms.validators import Optional
 from app.api.category_v1.category_crud import CategoryCRUD
+from app.core.cache_tags import CacheTagInvalidator, product_tag, restaurant_tag
+from app.core.cache_versions import bump_restaurant_versions
+from app.core.menu_read_model import rebuild_restaurant_menus
 from app.core.models import db_helper
 from app.core.models.product_model import Product
+from app.core.negative_cache import PRODUCT, clear_missing
 from app.utils.upload_image import save_image, delete_image
 
 
@@ -77,6 +82,16 @@ class ProductAdmin(ModelView, model=Product):
         """
         Вызывается при сохранении объекта через админку.
         """
+        # Продукт мог быть перенесен в другой ресторан: запоминаем прежний, чтобы
+        # после сохранения пересобрать меню и сбросить кэш обоих. Если данные
+        # формы уже применены, прежнее значение - в истории атрибута, иначе
+        # оно еще в самой модели
+        history = inspect(model).attrs.restaurant_id.history
+        if history.deleted:
+            model._old_restaurant_id = history.deleted[0]
+        else:
+            model._old_restaurant_id = None if is_created else model.restaurant_id
+
         new_image = data.pop("image", None)  # Извлекаем изображение из данных формы
 
         if new_image:
@@ -96,8 +111,38 @@ class ProductAdmin(ModelView, model=Product):
         # Удаляем изображение, если объект удаляется
         await delete_image(model.image_url)
 
-        # Настройка ForeignKey-полей
+    async def after_model_change(
+        self, data: dict, model: Product, is_created: bool, request: Request
+    ) -> None:
+        """
+        Вызывается после сохранения объекта через админку: пересобираем меню
+        ресторана (и прежнего ресторана при переносе) и сбрасываем их кэш.
+        """
+        restaurant_ids = {model.restaurant_id}
+        old_restaurant_id = getattr(model, "_old_restaurant_id", None)
+        if old_restaurant_id is not None:
+            restaurant_ids.add(old_restaurant_id)
+        await rebuild_restaurant_menus(restaurant_ids=restaurant_ids)
+        CacheTagInvalidator.schedule(
+            product_tag(model.id),
+            *(restaurant_tag(restaurant_id) for restaurant_id in restaurant_ids),
+        )
+        await bump_restaurant_versions(restaurant_ids=restaurant_ids)
+        if is_created:
+            await clear_missing(PRODUCT, model.id)
+
+    async def after_model_delete(self, model: Product, request: Request) -> None:
+        """
+        Вызывается после удаления объекта через админку: пересобираем меню
+        ресторана и сбрасываем его кэш.
+        """
+        await rebuild_restaurant_menus(restaurant_ids=[model.restaurant_id])
+        CacheTagInvalidator.schedule(
+            product_tag(model.id), restaurant_tag(model.restaurant_id)
+        )
+        await bump_restaurant_versions(restaurant_ids=[model.restaurant_id])
 
+    # Настройка ForeignKey-полей
     form_args = {
         # "restaurant_id": {
         #     "query_factory": lambda: get_all_categories,
@@ -1,5 +1,20 @@
+from fastapi import Request
 from sqladmin import ModelView
+from sqlalchemy import select
+
+from app.api.restaurant_v1.restaurant_filter import RestaurantFilter
+from app.api.restaurant_v1.restaurant_slugs import RestaurantSlugMap, slug_matches_name
+from app.core.cache_tags import (
+    RESTAURANTS_TAG,
+    CacheTagInvalidator,
+    restaurant_tag,
+)
+from app.core.cache_versions import bump_restaurant_versions
+from app.core.menu_read_model import rebuild_restaurant_menus
+from app.core.models.db_helper import db_helper
 from app.core.models.restaurant_model import Restaurant
+from app.core.negative_cache import RESTAURANT, clear_missing
+from app.utils.slug_generate import slugify
 
 
 class RestaurantAdmin(ModelView, model=Restaurant):
@@ -68,3 +83,54 @@ class RestaurantAdmin(ModelView, model=Restaurant):
     name = "Ресторан"
     name_plural = "Рестораны"
     icon = "fa fa-copyright"
+
+    async def on_model_change(
+        self, data: dict, model: Restaurant, is_created: bool, request: Request
+    ) -> None:
+        """
+        Вызывается до сохранения ресторана через админку (данные формы еще не
+        применены): запоминаем прежний slug
+        """
+        model._old_slug = None if is_created else model.slug
+        model._slug_regenerated = False
+        if is_created or not data.get("name"):
+            return
+        # При переименовании slug следует за названием, как в API, если его
+        # не изменили в форме вручную (уникальность - в том же UPDATE)
+        base_slug = slugify(data["name"])
+        if data.get("slug") in (None, model.slug) and not slug_matches_name(
+            model.slug, base_slug
+        ):
+            data.pop("slug", None)
+            model.slug = Restaurant.unique_slug(base_slug)
+            model._slug_regenerated = True
+
+    async def after_model_change(
+        self, data: dict, model: Restaurant, is_created: bool, request: Request
+    ) -> None:
+        """
+        Вызывается после сохранения ресторана через админку: пересобираем меню,
+        сбрасываем его кэш и переносим slug в карте slug -> ресторан
+        """
+        slug = model.slug
+        if getattr(model, "_slug_regenerated", False):
+            # Slug вычислен в самом UPDATE: читаем получившееся значение
+            async with db_helper.session_factory() as session:
+                slug = await session.scalar(
+                    select(Restaurant.slug).where(Restaurant.id == model.id)
+                )
+        await rebuild_restaurant_menus(restaurant_ids=[model.id])
+        CacheTagInvalidator.schedule(restaurant_tag(model.id), RESTAURANTS_TAG)
+        await bump_restaurant_versions(restaurant_uuids=[model.uuid])
+        await RestaurantSlugMap.set(
+            slug, model.id, model.uuid, old_slug=getattr(model, "_old_slug", None)
+        )
+        if is_created:
+            await clear_missing(RESTAURANT, model.uuid)
+            await RestaurantFilter.notify_created(model.uuid)
+
+    async def after_model_delete(self, model: Restaurant, request: Request) -> None:
+        """Вызывается после удаления ресторана через админку: сбрасываем кэш меню"""
+        CacheTagInvalidator.schedule(restaurant_tag(model.id), RESTAURANTS_TAG)
+        await bump_restaurant_versions(restaurant_uuids=[model.uuid])
+        await RestaurantSlugMap.delete(model.slug)
@@ -1,6 +1,9 @@
+from fastapi import Request
 from sqladmin import ModelView
 
+from app.core.cache_tags import TIERS_TAG, CacheTagInvalidator
 from app.core.models import Tier
+from app.core.reference_data import ReferenceData
 
 
 class TierAdmin(ModelView, model=Tier):
@@ -24,3 +27,15 @@ class TierAdmin(ModelView, model=Tier):
     name = "Уровень доступа"
     name_plural = "Уровни доступа"
     icon = "fa-solid fa-layer-group"
+
+    async def after_model_change(
+        self, data: dict, model: Tier, is_created: bool, request: Request
+    ) -> None:
+        """Вызывается после сохранения уровня через админку: сбрасываем кэш уровней"""
+        CacheTagInvalidator.schedule(TIERS_TAG)
+        await ReferenceData.notify_changed()
+
+    async def after_model_delete(self, model: Tier, request: Request) -> None:
+        """Вызывается после удаления уровня через админку: сбрасываем кэш уровней"""
+        CacheTagInvalidator.schedule(TIERS_TAG)
+        await ReferenceData.notify_changed()
@@ -6,6 +6,7 @@ from .restaurant_v1 import restaurant_router
 from .portions_v1 import portions_router
 from .category_v1 import category_router
 from .products_v1 import products_router
+from .metrics_v1 import metrics_router
 
 router = APIRouter()
 
@@ -18,3 +19,5 @@ router.include_router(restaurant_router, prefix="/restaurant")
 router.include_router(portions_router, prefix="/portions")
 router.include_router(category_router, prefix="/categories")
 router.include_router(products_router, prefix="/products")
+
+router.include_router(metrics_router, prefix="/metrics")
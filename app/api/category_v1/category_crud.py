@@ -5,7 +5,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from app.core.cache_versions import bump_restaurant_versions
+from app.core.dto import CategoryRow
+from app.core.menu_read_model import rebuild_restaurant_menus
 from app.core.models.category_model import Category
+from app.core.models.db_helper import DB_UNAVAILABLE_ERRORS
+from app.core.reference_data import ReferenceData
 from app.core.schemas import category_schemas
 
 logger = logging.getLogger(__name__)
@@ -13,11 +18,12 @@ logger = logging.getLogger(__name__)
 
 class CategoryCRUD:
     @staticmethod
-    async def get_all_categories(db: AsyncSession) -> List[Category]:
+    async def get_all_categories(db: AsyncSession) -> List[CategoryRow]:
         try:
-            result = await db.execute(select(Category).order_by(Category.name))
-            result = result.scalars().all()
-            return list(result)
+            # Категории берем из снимка справочников в памяти воркера
+            return await ReferenceData.get_categories(db)
+        except DB_UNAVAILABLE_ERRORS:
+            raise  # БД недоступна: ответ 503, а не 404
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -34,6 +40,8 @@ class CategoryCRUD:
             )
             result = result.scalars().first()
             return result
+        except DB_UNAVAILABLE_ERRORS:
+            raise  # БД недоступна: ответ 503, а не 404
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -49,6 +57,7 @@ class CategoryCRUD:
             db.add(db_category)
             await db.commit()
             await db.refresh(db_category)
+            await ReferenceData.notify_changed()
             return db_category
         except Exception as e:
             logger.error(f"Ошибка при создании категории: {str(e)}")
@@ -72,8 +81,11 @@ class CategoryCRUD:
                 )
             for key, value in category.model_dump().items():
                 setattr(db_category, key, value)
+            await rebuild_restaurant_menus(db, category_ids=[category_id])
             await db.commit()
             await db.refresh(db_category)
+            await ReferenceData.notify_changed()
+            await bump_restaurant_versions(db, category_ids=[category_id])
             return db_category
         except Exception as e:
             logger.error(f"Ошибка при обновлении категории: {str(e)}")
@@ -94,7 +106,10 @@ class CategoryCRUD:
                     detail="Категория не найдена.",
                 )
             await db.delete(db_category)
+            await rebuild_restaurant_menus(db, category_ids=[category_id])
             await db.commit()
+            await ReferenceData.notify_changed()
+            await bump_restaurant_versions(db, category_ids=[category_id])
         except Exception as e:
             logger.error(f"Ошибка при удалении категории: {str(e)}")
             raise HTTPException(
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.api.auth_v1.validation_auth_helper import get_superuser_auth
+from app.core.cache_metrics import cache_metrics
+from app.core.local_cache import local_cache
+
+router = APIRouter(
+    tags=["Metrics"],
+)
+
+
+@router.get(
+    "/cache",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(get_superuser_auth)],
+)
+async def get_cache_metrics():
+    """
+    Метрики кэша в текстовом формате Prometheus (по текущему воркеру).
+
+    - cache_requests_total{family, result}: result = l1_hit | hit | miss | error
+    - cache_stale_total{family}: отдачи устаревших записей (stale-while-revalidate)
+    - cache_fills_total{family}, cache_fill_seconds{family}: построения значений
+    - cache_errors_total{family, operation}: ошибки Redis и сериализации
+    - cache_payload_bytes_total{family, operation}: объем прочитанных и записанных данных
+    - cache_operation_seconds{family, operation}: задержка GET/SET в Redis
+    - cache_codec_seconds{family, operation}: время кодирования и декодирования
+    - single_flight_calls_total{group, role}: объединенные запросы (leader | follower)
+    - menu_served_stale_total: страницы меню из резервной копии при недоступной БД
+    - circuit_state{breaker}: 0 - автомат закрыт, 1 - открыт (Redis обходится)
+    - circuit_opened_total, circuit_rejected_total, circuit_probes_total{result}
+    """
+    cache_metrics.set_gauge("cache_local_bytes", local_cache.size)
+    cache_metrics.set_gauge("cache_local_entries", len(local_cache))
+    return PlainTextResponse(
+        cache_metrics.render(), media_type="text/plain; version=0.0.4"
+    )
@@ -4,7 +4,14 @@ from typing import Optional, List
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from app.core.cache_tags import CacheTagInvalidator, product_tag
+from app.core.cache_versions import bump_restaurant_versions
+from app.core.dto import PortionRow
+from app.core.menu_read_model import rebuild_restaurant_menus
+from app.core.models.db_helper import DB_UNAVAILABLE_ERRORS
 from app.core.models.product_size_model import Portion
+from app.core.negative_cache import PORTIONS, clear_missing
+from app.core.read_queries import read_portions
 from app.core.schemas import product_size_schemas
 
 logger = logging.getLogger(__name__)
@@ -14,14 +21,14 @@ class PortionsCRUD:
     @staticmethod
     async def get_all_portions_by_product_id(
         db: AsyncSession, product_id: int
-    ) -> List[Portion]:
+    ) -> List[PortionRow]:
         """Получение всех порций продукта"""
         try:
-            result = await db.execute(
-                select(Portion).where(Portion.product_id == product_id)
-            )
-            result = result.scalars().all()
-            return list(result)
+            # Порции читаются записями PortionRow, без моделей
+            portions = await read_portions(db, [product_id])
+            return portions[product_id]
+        except DB_UNAVAILABLE_ERRORS:
+            raise  # БД недоступна: ответ 503, а не 404
         except Exception as e:
             logger.error(f"Ошибка при получении всех порций продукта: {str(e)}")
             raise HTTPException(
@@ -35,6 +42,8 @@ class PortionsCRUD:
         try:
             result = await db.execute(select(Portion).where(Portion.id == portion_id))
             return result.scalar_one_or_none()
+        except DB_UNAVAILABLE_ERRORS:
+            raise  # БД недоступна: ответ 503, а не 404
         except Exception as e:
             logger.error(f"Ошибка при получении порции по ID: {str(e)}")
             raise HTTPException(
@@ -52,8 +61,12 @@ class PortionsCRUD:
         try:
             db_portion = Portion(**portion.model_dump(), product_id=product_id)
             db.add(db_portion)
+            await rebuild_restaurant_menus(db, product_ids=[product_id])
             await db.commit()
             await db.refresh(db_portion)
+            CacheTagInvalidator.schedule(product_tag(product_id))
+            await bump_restaurant_versions(db, product_ids=[product_id])
+            await clear_missing(PORTIONS, product_id)
             return db_portion
         except Exception as e:
             logger.error(f"Ошибка при создании порции продукта: {str(e)}")
@@ -80,8 +93,11 @@ class PortionsCRUD:
                 )
             for key, value in portion.model_dump().items():
                 setattr(db_portion, key, value)
+            await rebuild_restaurant_menus(db, product_ids=[db_portion.product_id])
             await db.commit()
             await db.refresh(db_portion)
+            CacheTagInvalidator.schedule(product_tag(db_portion.product_id))
+            await bump_restaurant_versions(db, product_ids=[db_portion.product_id])
             return db_portion
         except Exception as e:
             logger.error(f"Ошибка при обновлении порции продукта: {str(e)}")
@@ -97,7 +113,10 @@ class PortionsCRUD:
             db_portion = result.scalar_one_or_none()
             if db_portion:
                 await db.delete(db_portion)
+                await rebuild_restaurant_menus(db, product_ids=[db_portion.product_id])
                 await db.commit()
+                CacheTagInvalidator.schedule(product_tag(db_portion.product_id))
+                await bump_restaurant_versions(db, product_ids=[db_portion.product_id])
                 return True
             return False
         except Exception as e:
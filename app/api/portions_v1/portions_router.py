@@ -1,10 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.auth_v1.validation_auth_helper import get_superuser_auth
 from app.api.portions_v1.portions_crud import PortionsCRUD
+from app.core.cache_decorator import cached
+from app.core.cache_tags import product_tag
 from app.core.schemas import product_size_schemas
 from app.core.schemas.product_size_schemas import PortionSize
 from app.core.models.db_helper import db_helper
+from app.core.negative_cache import PORTIONS, is_missing, mark_missing
+from app.core.redis import get_redis
+from app.core.single_flight import coalesce
 
 router = APIRouter(
     tags=["Portions"],
@@ -12,15 +18,25 @@ router = APIRouter(
 
 
 @router.get("/portions/{product_id}", response_model=list[PortionSize])
+@coalesce
+@cached(
+    "portions:product:{product_id}",
+    tags=(product_tag("{product_id}"),),
+    response_model=list[PortionSize],
+)
 async def get_portions_by_product_id(
     product_id: int,
     db: AsyncSession = Depends(db_helper.session_getter),
+    redis: Redis = Depends(get_redis),
 ):
     """Роутер для получения всех порций продукта."""
-    portions = await PortionsCRUD.get_all_portions_by_product_id(
-        db=db, product_id=product_id
-    )
+    portions = None
+    if not await is_missing(redis, PORTIONS, product_id):
+        portions = await PortionsCRUD.get_all_portions_by_product_id(
+            db=db, product_id=product_id
+        )
     if not portions:
+        await mark_missing(redis, PORTIONS, product_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Продукт не найден.",
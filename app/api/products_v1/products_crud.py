@@ -5,10 +5,17 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache_tags import CacheTagInvalidator, product_tag, restaurant_tag
+from app.core.cache_versions import bump_restaurant_versions
+from app.core.dto import ProductRow
+from app.core.menu_read_model import rebuild_restaurant_menus
 from app.core.models.category_model import Category
+from app.core.models.db_helper import DB_UNAVAILABLE_ERRORS
 from app.core.models.product_model import Product
 from app.core.models.product_size_model import Portion
 from app.core.models.restaurant_model import Restaurant
+from app.core.negative_cache import PORTIONS, PRODUCT, clear_missing
+from app.core.read_queries import read_product, read_products
 from app.core.schemas import product_schemas, product_size_schemas
 
 logger = logging.getLogger(__name__)
@@ -19,16 +26,20 @@ class ProductsCRUD:
     @staticmethod
     async def get_all_products(
         db: AsyncSession,
+        cursor: Optional[str],
+        limit: int,
         restaurant_id: Optional[int] = None,
-    ) -> List[Product]:
+    ) -> dict:
+        """
+        Страница продуктов ресторана по ID (схема CursorPage): записи ProductRow
+        с порциями, прочитанными одним запросом на страницу.
+        """
         try:
-            query_products = await db.execute(
-                select(Product)
-                .where(Product.restaurant_id == restaurant_id)
-                .options(selectinload(Product.portions))
-            )
-            products = query_products.scalars().all()
-            return list(products)
+            return await read_products(db, cursor, limit, restaurant_id=restaurant_id)
+        except HTTPException:
+            raise  # Некорректный курсор
+        except DB_UNAVAILABLE_ERRORS:
+            raise  # БД недоступна: ответ 503, а не 404
         except Exception as e:
             logger.error(f"Ошибка при получении списка продуктов: {str(e)}")
             raise HTTPException(
@@ -36,6 +47,22 @@ class ProductsCRUD:
                 detail="Продукты не найдены.",
             )
 
+    @staticmethod
+    async def read_product_by_id(
+        db: AsyncSession, product_id: int
+    ) -> Optional[ProductRow]:
+        """Продукт с порциями для чтения (запись ProductRow, без модели)"""
+        try:
+            return await read_product(db, product_id)
+        except DB_UNAVAILABLE_ERRORS:
+            raise  # БД недоступна: ответ 503, а не 404
+        except Exception as e:
+            logger.error(f"Ошибка при получении продукта по ID: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Продукт не найден.",
+            )
+
     @staticmethod
     async def create_only_product(
         db: AsyncSession, product_data: product_schemas.ProductCreate
@@ -43,8 +70,16 @@ class ProductsCRUD:
         try:
             db_product = Product(**product_data.model_dump())
             db.add(db_product)
+            await rebuild_restaurant_menus(
+                db, restaurant_ids=[db_product.restaurant_id]
+            )
             await db.commit()
             await db.refresh(db_product)
+            CacheTagInvalidator.schedule(restaurant_tag(db_product.restaurant_id))
+            await bump_restaurant_versions(
+                db, restaurant_ids=[db_product.restaurant_id]
+            )
+            await clear_missing(PRODUCT, db_product.id)
             return db_product
         except Exception as e:
             logger.error(f"Ошибка при создании продукта: {str(e)}")
@@ -65,6 +100,8 @@ class ProductsCRUD:
             )
             product = result.scalar_one_or_none()
             return product
+        except DB_UNAVAILABLE_ERRORS:
+            raise  # БД недоступна: ответ 503, а не 404
         except Exception as e:
             logger.error(f"Ошибка при получении продукта по ID: {str(e)}")
             raise HTTPException(
@@ -108,7 +145,16 @@ class ProductsCRUD:
                 portion_data["dish_id"] = db_product.id
                 db_portion = Portion(**portion_data.model_dump())
                 db.add(db_portion)
+            await rebuild_restaurant_menus(
+                db, restaurant_ids=[db_product.restaurant_id]
+            )
             await db.commit()
+            CacheTagInvalidator.schedule(restaurant_tag(db_product.restaurant_id))
+            await bump_restaurant_versions(
+                db, restaurant_ids=[db_product.restaurant_id]
+            )
+            await clear_missing(PRODUCT, db_product.id)
+            await clear_missing(PORTIONS, db_product.id)
             return db_product
         except Exception as e:
             logger.error(f"Ошибка при создании продукта: {str(e)}")
@@ -124,10 +170,23 @@ class ProductsCRUD:
             result = await db.execute(select(Product).where(Product.id == product_id))
             db_product = result.scalar_one_or_none()
             if db_product:
+                # Продукт мог быть перенесен в другой ресторан - сбрасываем оба
+                old_restaurant_id = db_product.restaurant_id
                 for key, value in product.model_dump().items():
                     setattr(db_product, key, value)
+                await rebuild_restaurant_menus(
+                    db, restaurant_ids=[old_restaurant_id, db_product.restaurant_id]
+                )
                 await db.commit()
                 await db.refresh(db_product)
+                CacheTagInvalidator.schedule(
+                    product_tag(product_id),
+                    restaurant_tag(old_restaurant_id),
+                    restaurant_tag(db_product.restaurant_id),
+                )
+                await bump_restaurant_versions(
+                    db, restaurant_ids=[old_restaurant_id, db_product.restaurant_id]
+                )
                 return db_product
             return None
         except Exception as e:
@@ -141,7 +200,16 @@ class ProductsCRUD:
             db_product = result.scalar_one_or_none()
             if db_product:
                 await db.delete(db_product)
+                await rebuild_restaurant_menus(
+                    db, restaurant_ids=[db_product.restaurant_id]
+                )
                 await db.commit()
+                CacheTagInvalidator.schedule(
+                    product_tag(product_id), restaurant_tag(db_product.restaurant_id)
+                )
+                await bump_restaurant_versions(
+                    db, restaurant_ids=[db_product.restaurant_id]
+                )
                 return True
             return False
         except Exception as e:
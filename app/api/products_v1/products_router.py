@@ -1,40 +1,66 @@
-from typing import List, Annotated, Optional
+from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth_v1.validation_auth_helper import get_superuser_auth
 from app.api.products_v1.products_crud import ProductsCRUD
+from app.core.cache_decorator import cached
+from app.core.cache_tags import product_tag, restaurant_tag
 from app.core.models.db_helper import db_helper
+from app.core.negative_cache import PRODUCT, is_missing, mark_missing
+from app.core.pagination import DEFAULT_LIMIT, Cursor, Limit
+from app.core.redis import get_redis
 from app.core.schemas import product_schemas
+from app.core.schemas.base_schemas import CursorPage
 from app.core.schemas.product_schemas import Product
+from app.core.single_flight import coalesce
 
 router = APIRouter(
     tags=["Products"],
 )
 
 
-@router.get("/products/{restaurant_id}/", response_model=List[Product])
+@router.get("/products/{restaurant_id}/", response_model=CursorPage[Product])
+@coalesce
+@cached(
+    "products:restaurant:{restaurant_id}:{cursor}:{limit}",
+    tags=(
+        restaurant_tag("{restaurant_id}"),
+        lambda page: [product_tag(product["id"]) for product in page["items"]],
+    ),
+    response_model=CursorPage[Product],
+)
 async def get_list_products(
     db: Annotated[AsyncSession, Depends(db_helper.session_getter)],
     restaurant_id: Optional[int] = None,
+    cursor: Cursor = None,
+    limit: Limit = DEFAULT_LIMIT,
 ):
-    """Получение списка продуктов"""
+    """Получение списка продуктов с курсорной пагинацией"""
     products = await ProductsCRUD.get_all_products(
         db=db,
+        cursor=cursor,
+        limit=limit,
         restaurant_id=restaurant_id,
     )
     return products
 
 
 @router.get("/products/{product_id}", response_model=product_schemas.Product)
+@coalesce
 async def get_product(
     db: Annotated[AsyncSession, Depends(db_helper.session_getter)],
     product_id: int,
+    redis: Redis = Depends(get_redis),
 ):
     """Получение продукта"""
-    product = await ProductsCRUD.get_product_by_id(db=db, product_id=product_id)
+    product = None
+    if not await is_missing(redis, PRODUCT, product_id):
+        product = await ProductsCRUD.read_product_by_id(db=db, product_id=product_id)
     if not product:
+        await mark_missing(redis, PRODUCT, product_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Продукт не найден.",
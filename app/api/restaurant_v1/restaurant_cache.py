@@ -0,0 +1,349 @@
+import logging
+from typing import Optional
+from uuid import UUID
+
+import orjson
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.api.restaurant_v1.restaurant_crud import RestaurantCRUD
+from app.api.restaurant_v1.restaurant_filter import reject_unknown_restaurant
+from app.core.cache_lock import cache_get_or_set
+from app.core.cache_metrics import cache_metrics, key_family
+from app.core.cache_versions import drop_restaurant_version, get_restaurant_version
+from app.core.config import settings
+from app.core.http_cache import IDENTITY, compress_body
+from app.core.local_cache import local_cache
+from app.core.models.db_helper import DB_UNAVAILABLE_ERRORS, db_helper
+from app.core.negative_cache import RESTAURANT, is_missing, mark_missing
+from app.core.pagination import cursor_position
+from app.core.redis_utils import cache_get, cache_set, encode_value
+from app.core.single_flight import menu_flight
+
+logger = logging.getLogger(__name__)
+
+TOTAL_PAGES_FIELD = "total_pages"  # Поле хеша готовых тел с числом страниц меню
+STALE_FIELD = "stale"  # Признак страницы меню из резервной копии
+
+# ========================
+# Ключи кэша меню ресторана
+# ========================
+
+
+def menu_cache_key(
+    restaurant_uuid: UUID,
+    version: int,
+    page: int,
+    page_size: int,
+    category_filter: Optional[str],
+    after: Optional[int] = None,
+) -> str:
+    """
+    Ключ кэша страницы меню ресторана.
+
+    Версия содержимого ресторана входит в ключ: изменение ресторана, его продуктов,
+    порций или категорий увеличивает версию, и все страницы и фильтры сразу
+    читаются по новым ключам, а старые записи истекают по TTL.
+
+    /after: Позиция курсора вместо номера страницы (keyset-пагинация).
+    """
+    position = page if after is None else f"after{after}"
+    return (
+        f"restaurant:{restaurant_uuid}:with_products:{version}:"
+        f"{position}:{page_size}:{category_filter}"
+    )
+
+
+def menu_count_key(
+    restaurant_uuid: UUID, version: int, category_filter: Optional[str]
+) -> str:
+    """Ключ счетчика продуктов меню (с фильтром категории) под версией ресторана"""
+    return f"restaurant:{restaurant_uuid}:menu_count:{version}:{category_filter}"
+
+
+def page_cache_key(
+    route: str,
+    host: str,
+    restaurant_uuid: UUID,
+    version: int,
+    page: int,
+    page_size: int,
+    category_filter: Optional[str],
+    is_ajax: bool,
+) -> str:
+    """Ключ кэша отрисованной HTML-страницы меню (с версией ресторана, как у данных)"""
+    return (
+        f"html:{route}:{host}:{restaurant_uuid}:{version}:{page}:{page_size}:"
+        f"{category_filter}:{int(is_ajax)}"
+    )
+
+
+def menu_fallback_key(
+    restaurant_uuid: UUID,
+    page: int,
+    page_size: int,
+    category_filter: Optional[str],
+    after: Optional[int] = None,
+) -> str:
+    """Ключ резервной копии страницы меню: последняя удачная сборка без версии"""
+    position = page if after is None else f"after{after}"
+    return (
+        f"restaurant:{restaurant_uuid}:menu_fallback:"
+        f"{position}:{page_size}:{category_filter}"
+    )
+
+
+def parse_menu_cursor(cursor: str, category_filter: Optional[str]) -> int:
+    """
+    ID последнего продукта из курсора меню. Курсор привязан к фильтру категории:
+    курсор другой категории или поддельный курсор - 400.
+    """
+    return cursor_position(cursor, category_filter)
+
+
+# ========================
+# Резервная копия меню на время недоступности БД
+# ========================
+
+
+async def save_menu_fallback(redis: Redis, key: str, menu: dict) -> None:
+    """
+    Сохранить последнюю удачную сборку страницы меню на `menu_fallback_ttl`.
+    Пишется напрямую в Redis, мимо L1: копия читается только при отказе БД.
+    """
+    try:
+        await redis.set(key, encode_value(menu), ex=settings.cache.menu_fallback_ttl)
+    except (RedisError, TypeError) as e:
+        logger.error(f"Не удалось сохранить резервную копию меню {key}: {e}")
+
+
+async def get_menu_fallback(redis: Redis, key: str) -> Optional[dict]:
+    """Резервная копия страницы меню с признаком `stale` или None"""
+    menu = await cache_get(redis, key, use_local=False)
+    if menu is None:
+        return None
+    cache_metrics.inc("menu_served_stale_total")
+    return {**menu, STALE_FIELD: True}
+
+
+async def get_restaurant_menu_cached(
+    redis: Redis,
+    restaurant_uuid: UUID,
+    page: int,
+    page_size: int,
+    category_filter: Optional[str] = None,
+    version: Optional[int] = None,
+    after: Optional[int] = None,
+) -> dict:
+    """
+    Страница меню ресторана из кэша, при промахе - из БД (404, если ресторана нет).
+
+    Страница кэшируется под текущей версией ресторана, которая записывается и
+    в саму страницу: по ней строится ETag, который никогда не опережает данные.
+
+    Неизвестный UUID отклоняется фильтром ресторанов в памяти, а отсутствие
+    ресторана кэшируется на `settings.cache.negative_ttl` секунд. Одновременные
+    запросы одной страницы в воркере объединяются (single-flight).
+
+    Если БД недоступна, отдается последняя удачная сборка страницы с полем
+    `stale: true` (даже после истечения TTL кэша); без нее ошибка пробрасывается.
+    Если версию ресторана нельзя прочитать из Redis, страница строится из БД
+    без кэша, а ее поле `version` равно None.
+
+    Число продуктов кэшируется отдельно под версией ресторана и фильтром, поэтому
+    count(*) выполняется один раз на версию, а не на каждую страницу.
+
+    /version: Уже прочитанная вызывающим версия ресторана (экономит запрос к Redis).
+    /after: ID последнего продукта предыдущей страницы (keyset-пагинация).
+    """
+    reject_unknown_restaurant(restaurant_uuid)
+
+    try:
+        if version is None:
+            version = await get_restaurant_version(redis, restaurant_uuid)
+        if version is None:
+            # Версия создается только для ресторанов, не отмеченных как отсутствующие
+            if await is_missing(redis, RESTAURANT, restaurant_uuid):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Ресторан не найден.",
+                )
+            version = await get_restaurant_version(redis, restaurant_uuid, create=True)
+    except RedisError as e:
+        # Версия неизвестна: страница строится из БД без кэша и ETag
+        logger.warning(f"Версия ресторана {restaurant_uuid} недоступна: {e}")
+        return await load_menu_uncached(
+            restaurant_uuid, page, page_size, category_filter, after
+        )
+
+    # Определяем ключ для кэша
+    cache_key = menu_cache_key(
+        restaurant_uuid, version, page, page_size, category_filter, after
+    )
+    fallback_key = menu_fallback_key(
+        restaurant_uuid, page, page_size, category_filter, after
+    )
+    count_key = menu_count_key(restaurant_uuid, version, category_filter)
+
+    async def load_menu() -> dict:
+        # Отметка проверяется и при существующей версии: не идем в БД повторно
+        if await is_missing(redis, RESTAURANT, restaurant_uuid):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Ресторан не найден.",
+            )
+        db_helper.ensure_available()
+        total_products = await cache_get(redis, count_key)
+        # Собственная сессия: загрузчик может выполняться за другой запрос
+        async with db_helper.session_factory() as db:
+            menu = await RestaurantCRUD.get_restaurant_menu(
+                db=db,
+                restaurant_uuid=restaurant_uuid,
+                page=page,
+                page_size=page_size,
+                category_filter=category_filter,
+                after=after,
+                total_products=total_products,
+            )
+        if menu is not None and total_products is None:
+            await cache_set(
+                redis=redis,
+                key=count_key,
+                value=menu["pagination"]["total_products"],
+                expire=settings.menu.count_ttl,
+            )
+        if menu is None:
+            await mark_missing(redis, RESTAURANT, restaurant_uuid)
+            # Версия была создана до проверки в БД: не оставляем ее на version_ttl
+            await drop_restaurant_version(redis, restaurant_uuid)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Ресторан не найден.",
+            )
+        menu["version"] = version
+        await save_menu_fallback(redis, fallback_key, menu)
+        return menu
+
+    # Берем страницу из кэша, при промахе ее строит только один воркер,
+    # устаревшая страница отдается сразу и обновляется в фоне.
+    # Теги не нужны: после изменения ресторана ключ сменится вместе с версией.
+    # Одновременные запросы той же страницы в воркере ждут один вызов
+    try:
+        return await menu_flight.do(
+            cache_key,
+            lambda: cache_get_or_set(
+                redis=redis,
+                key=cache_key,
+                loader=load_menu,
+                expire=settings.cache.menu_ttl,
+                stale_ttl=settings.cache.menu_stale_ttl,
+            ),
+        )
+    except DB_UNAVAILABLE_ERRORS as e:
+        db_helper.mark_unavailable(e)
+        menu = await get_menu_fallback(redis, fallback_key)
+        if menu is None:
+            raise
+        return menu
+
+
+async def load_menu_uncached(
+    restaurant_uuid: UUID,
+    page: int,
+    page_size: int,
+    category_filter: Optional[str],
+    after: Optional[int] = None,
+) -> dict:
+    """
+    Страница меню напрямую из БД, когда версия ресторана недоступна (Redis).
+    Результат не кэшируется; поле `version` равно None.
+    """
+    db_helper.ensure_available()
+    async with db_helper.session_factory() as db:
+        menu = await RestaurantCRUD.get_restaurant_menu(
+            db=db,
+            restaurant_uuid=restaurant_uuid,
+            page=page,
+            page_size=page_size,
+            category_filter=category_filter,
+            after=after,
+        )
+    if menu is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ресторан не найден.",
+        )
+    menu["version"] = None
+    return menu
+
+
+# ========================
+# Готовые тела ответа меню
+# ========================
+#
+# Тело JSON-ответа хранится в хеше Redis рядом с данными меню: поле на каждый
+# Content-Encoding (identity, gzip, br) и число страниц для предзагрузки.
+# Попадание отдается как есть - без разбора, сериализации и сжатия.
+
+
+def menu_body_key(menu_key: str) -> str:
+    """Ключ хеша готовых тел ответа для ключа кэша страницы меню"""
+    return f"{menu_key}:body"
+
+
+async def get_menu_body(
+    redis: Redis, menu_key: str, encoding: str
+) -> Optional[tuple[bytes, str, int]]:
+    """
+    Готовое тело ответа: (тело, его Content-Encoding, число страниц) или None.
+    Если нужного сжатия нет (короткое тело), возвращается несжатый вариант.
+    """
+    key = menu_body_key(menu_key)
+    family = f"{key_family(key)}:body"
+    local_key = f"{key}:{encoding}"  # Под запрошенным сжатием, даже если его нет
+    cached = local_cache.get(local_key)
+    if cached is not None:
+        cache_metrics.inc("cache_requests_total", family=family, result="l1_hit")
+        return cached
+    try:
+        body, identity, total_pages = await redis.hmget(
+            key, encoding, IDENTITY, TOTAL_PAGES_FIELD
+        )
+    except RedisError as e:
+        logger.error(f"Ошибка при чтении тела ответа {key} из Redis: {e}")
+        cache_metrics.inc("cache_requests_total", family=family, result="error")
+        return None
+    if identity is None:
+        cache_metrics.inc("cache_requests_total", family=family, result="miss")
+        return None
+    if body is None:
+        body, encoding = identity, IDENTITY
+    cache_metrics.inc("cache_requests_total", family=family, result="hit")
+    cached = (body, encoding, int(total_pages))
+    local_cache.set(local_key, cached, size=len(body))
+    return cached
+
+
+def menu_body(menu: dict) -> bytes:
+    """Тело JSON-ответа страницы меню"""
+    # Та же сериализация, что у ORJSONResponse после jsonable_encoder
+    return orjson.dumps(jsonable_encoder(menu), option=orjson.OPT_NON_STR_KEYS)
+
+
+async def set_menu_body(redis: Redis, menu_key: str, menu: dict) -> dict[str, bytes]:
+    """Сериализовать и сжать страницу меню, сохранить варианты тела в кэш"""
+    variants = compress_body(menu_body(menu))
+    key = menu_body_key(menu_key)
+    try:
+        pipe = redis.pipeline(transaction=True)
+        pipe.hset(
+            key,
+            mapping={**variants, TOTAL_PAGES_FIELD: menu["pagination"]["total_pages"]},
+        )
+        pipe.expire(key, settings.cache.menu_ttl)
+        await pipe.execute()
+    except RedisError as e:
+        logger.error(f"Ошибка при записи тела ответа {key} в Redis: {e}")
+    return variants
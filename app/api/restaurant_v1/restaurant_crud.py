@@ -1,12 +1,37 @@
 import logging
 from uuid import UUID
-from typing import Optional, List
+from typing import Optional
 
-from sqlalchemy import select
+import orjson
+from sqlalchemy import Text, cast, false, func, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
 
+from app.api.restaurant_v1.restaurant_filter import RestaurantFilter
+from app.api.restaurant_v1.restaurant_slugs import RestaurantSlugMap, slug_matches_name
+from app.core.cache_tags import (
+    RESTAURANTS_TAG,
+    CacheTagInvalidator,
+    restaurant_tag,
+)
+from app.core.cache_versions import bump_restaurant_versions
+from app.core.config import settings
+from app.core.menu_read_model import (
+    get_menu_document,
+    menu_page,
+    rebuild_restaurant_menus,
+)
+from app.core.models.category_model import Category
+from app.core.models.db_helper import DB_UNAVAILABLE_ERRORS
+from app.core.models.product_model import Product
+from app.core.models.product_size_model import Portion
 from app.core.models.restaurant_model import Restaurant
+from app.core.negative_cache import RESTAURANT, clear_missing
+from app.core.pagination import menu_pagination
+from app.core.read_queries import read_restaurants
+from app.core.reference_data import ReferenceData
+from app.core.sql_json import json_array, json_object
+from app.core.redis_utils import to_dict
 from fastapi import HTTPException, status
 
 from app.core.schemas import restaurant_schemas, product_schemas
@@ -32,6 +57,8 @@ class RestaurantCRUD:
                 select(Restaurant).where(Restaurant.uuid == restaurant_uuid)
             )
             return query_restaurant.scalar_one_or_none()
+        except DB_UNAVAILABLE_ERRORS:
+            raise  # БД недоступна: ответ 503, а не 404
         except Exception as e:
             logger.error(f"Ошибка при получении ресторана по UUID: {str(e)}")
             raise HTTPException(
@@ -39,17 +66,302 @@ class RestaurantCRUD:
                 detail="Ресторан не найден.",
             )
 
+    # ====================================
+    # Функция получения страницы меню ресторана
+    # ====================================
+    @staticmethod
+    async def get_restaurant_menu(
+        db: AsyncSession,
+        restaurant_uuid: UUID,
+        page: int,
+        page_size: int,
+        category_filter: Optional[str] = None,
+        after: Optional[int] = None,
+        total_products: Optional[int] = None,
+    ) -> Optional[dict]:
+        """
+        Страница меню ресторана с категориями и пагинацией. None - ресторан не найден.
+
+        Страница выбирается по номеру (OFFSET) или, если передан `after`, по ключу:
+        продукты с id больше последнего отданного (keyset, не зависит от глубины).
+        В обоих случаях в пагинации возвращается `next_cursor` следующей страницы.
+
+        Источник задается `settings.menu.source`: документ модели чтения
+        restaurant_menus (read_model, одно чтение по ключу), объекты ORM (orm)
+        или JSON-документ, собранный запросом к таблицам (sql).
+
+        /after: ID последнего продукта предыдущей страницы (из курсора).
+        /total_products: Уже известное число продуктов (из кэша) - без count(*).
+        """
+        if settings.menu.source == "read_model":
+            document = await get_menu_document(db, restaurant_uuid)
+            if document is None:
+                return None
+            return menu_page(document, page, page_size, category_filter, after)
+        if settings.menu.source == "sql":
+            return await RestaurantCRUD.get_restaurant_menu_json(
+                db,
+                restaurant_uuid,
+                page,
+                page_size,
+                category_filter,
+                after,
+                total_products,
+            )
+
+        # Получаем ресторан
+        db_restaurant = await RestaurantCRUD.get_restaurant_by_uuid(db, restaurant_uuid)
+        if not db_restaurant:
+            return None
+
+        # Получаем все категории ресторана: ID из продуктов, сами категории - из
+        # снимка справочников в памяти воркера
+        category_ids = await db.execute(
+            select(Product.category_id)
+            .where(
+                Product.restaurant_id == db_restaurant.id,
+                Product.category_id.is_not(None),
+            )
+            .distinct()
+        )
+        categories = await ReferenceData.get_categories_by_ids(
+            db, category_ids.scalars().all()
+        )
+
+        # Базовый запрос продуктов. Порции загружаются отдельным запросом
+        # (selectinload), поэтому LIMIT применяется к продуктам, а не к строкам JOIN
+        products_query = (
+            select(Product)
+            .options(selectinload(Product.portions))
+            .where(Product.restaurant_id == db_restaurant.id)
+        )
+
+        # Применяем фильтр по категории, если указан
+        if category_filter:
+            products_query = products_query.where(
+                await RestaurantCRUD._menu_category_clause(db, category_filter)
+            )
+
+        # Подсчет общего количества продуктов (если он не известен из кэша)
+        if total_products is None:
+            total_products_query = select(func.count()).select_from(
+                products_query.subquery()
+            )
+            total_products = (await db.execute(total_products_query)).scalar_one()
+
+        # Добавляем пагинацию: по ключу или по смещению. Лишний продукт
+        # показывает, есть ли следующая страница
+        if after is not None:
+            products_query = products_query.where(Product.id > after)
+        else:
+            products_query = products_query.offset((page - 1) * page_size)
+        products_query = products_query.order_by(Product.id).limit(page_size + 1)
+
+        # Получаем продукты
+        products = (await db.execute(products_query)).scalars().all()
+        has_more = len(products) > page_size
+        products = products[:page_size]
+
+        # Подготавливаем данные для ответа
+        products_data = []
+        for product in products:
+            product_data = {
+                "id": product.id,
+                "name": product.name,
+                "description": product.description,
+                "image_url": product.image_url,
+                "category": {
+                    "id": product.category_id,
+                },
+                "portions": [
+                    {
+                        "id": portion.id,
+                        "name": portion.name,
+                        "unit_type": portion.unit_type.value,
+                        "size": portion.size,
+                        "price": portion.price,
+                        "is_available": portion.is_available,
+                    }
+                    for portion in product.portions
+                ],
+            }
+            products_data.append(product_data)
+
+        return {
+            "restaurant": to_dict(db_restaurant),
+            "categories": [
+                {"id": cat.id, "name": cat.name, "slug": cat.slug} for cat in categories
+            ],
+            "products": products_data,
+            "pagination": menu_pagination(
+                page,
+                page_size,
+                total_products,
+                category_filter,
+                after,
+                products[-1].id if has_more else None,
+            ),
+        }
+
+    @staticmethod
+    async def get_restaurant_menu_json(
+        db: AsyncSession,
+        restaurant_uuid: UUID,
+        page: int,
+        page_size: int,
+        category_filter: Optional[str] = None,
+        after: Optional[int] = None,
+        total_products: Optional[int] = None,
+    ) -> Optional[dict]:
+        """
+        Страница меню, собранная в PostgreSQL одним запросом (json_build_object,
+        json_agg): ресторан, категории, продукты с порциями и число продуктов.
+
+        Объекты ORM не создаются: БД возвращает документ текстом, который
+        разбирается один раз (orjson); в Python остается только пагинация.
+        Формат совпадает с get_restaurant_menu, кроме типов ресторана: UUID и
+        дата создания приходят строками ISO, как и после сериализации в JSON.
+        """
+        restaurants = Restaurant.__table__
+        # ID ресторана по UUID (уникальный индекс) - подзапрос выполняется один раз
+        restaurant_id = (
+            select(Restaurant.id)
+            .where(Restaurant.uuid == restaurant_uuid)
+            .correlate(None)
+            .scalar_subquery()
+        )
+
+        # Фильтр продуктов ресторана (и категории, если указана)
+        conditions = [Product.restaurant_id == restaurant_id]
+        if category_filter:
+            conditions.append(
+                await RestaurantCRUD._menu_category_clause(db, category_filter)
+            )
+
+        # Категории ресторана по названию, как в снимке справочников
+        category_ids = select(Product.category_id).where(
+            Product.restaurant_id == restaurant_id,
+            Product.category_id.is_not(None),
+        )
+        categories = (
+            select(
+                json_array(
+                    json_object(id=Category.id, name=Category.name, slug=Category.slug),
+                    Category.name,
+                )
+            )
+            .where(Category.id.in_(category_ids))
+            .scalar_subquery()
+        )
+
+        # Страница продуктов (лишний продукт - признак следующей страницы)
+        page_query = select(
+            Product.id,
+            Product.name,
+            Product.description,
+            Product.image_url,
+            Product.category_id,
+        ).where(*conditions)
+        if after is not None:
+            page_query = page_query.where(Product.id > after)
+        else:
+            page_query = page_query.offset((page - 1) * page_size)
+        products_page = (
+            page_query.order_by(Product.id).limit(page_size + 1).subquery("page")
+        )
+
+        # Порции продукта страницы. Enum хранится именем (GRAMS), в ответе -
+        # значение (grams), поэтому имя приводится к нижнему регистру
+        portion = json_object(
+            id=Portion.id,
+            name=Portion.name,
+            unit_type=func.lower(cast(Portion.unit_type, Text)),
+            size=Portion.size,
+            price=Portion.price,
+            is_available=Portion.is_available,
+        )
+        portions = (
+            select(json_array(portion, Portion.id))
+            .where(Portion.product_id == products_page.c.id)
+            .scalar_subquery()
+        )
+        product = json_object(
+            id=products_page.c.id,
+            name=products_page.c.name,
+            description=products_page.c.description,
+            image_url=products_page.c.image_url,
+            category=json_object(id=products_page.c.category_id),
+            portions=portions,
+        )
+        products = select(json_array(product, products_page.c.id)).scalar_subquery()
+
+        # Число продуктов: из кэша или count(*) в том же запросе
+        if total_products is None:
+            total = (
+                select(func.count()).select_from(Product).where(*conditions)
+            ).scalar_subquery()
+        else:
+            total = literal(total_products)
+
+        restaurant = (
+            select(func.row_to_json(restaurants.table_valued()))
+            .where(restaurants.c.uuid == restaurant_uuid)
+            .scalar_subquery()
+        )
+        document = json_object(
+            restaurant=restaurant,
+            categories=categories,
+            products=products,
+            total_products=total,
+        )
+        # Документ приводится к тексту: драйвер не разбирает JSON сам
+        query = select(cast(document, Text))
+        menu = orjson.loads((await db.execute(query)).scalar_one())
+        if menu["restaurant"] is None:
+            return None
+
+        products_data = menu["products"]
+        has_more = len(products_data) > page_size
+        del products_data[page_size:]
+        menu["pagination"] = menu_pagination(
+            page,
+            page_size,
+            menu.pop("total_products"),
+            category_filter,
+            after,
+            products_data[-1]["id"] if has_more else None,
+        )
+        return menu
+
+    @staticmethod
+    async def _menu_category_clause(db: AsyncSession, category_filter: str):
+        """Условие фильтра продуктов по slug категории (неизвестный slug - пусто)"""
+        category = await ReferenceData.get_category_by_slug(db, category_filter)
+        return Product.category_id == category.id if category else false()
+
     # ====================================
     # Функция получения всех ресторанов
     # ====================================
     @staticmethod
     async def get_all_restaurants(
         db: AsyncSession,
-    ) -> List[Restaurant]:
+        cursor: Optional[str],
+        limit: int,
+        is_active: Optional[bool] = None,
+        owner_id: Optional[int] = None,
+    ) -> dict:
+        """
+        Страница ресторанов по ID (схема CursorPage) с фильтрами по индексам.
+        Рестораны читаются записями RestaurantRow (без описаний), не моделями.
+        """
         try:
-            query_restaurants = await db.execute(select(Restaurant))
-            result = query_restaurants.scalars().all()
-            return list(result)
+            return await read_restaurants(
+                db, cursor, limit, is_active=is_active, owner_id=owner_id
+            )
+        except HTTPException:
+            raise  # Некорректный курсор
+        except DB_UNAVAILABLE_ERRORS:
+            raise  # БД недоступна: ответ 503, а не 404
         except Exception as e:
             logger.error(f"Ошибка при получении всех ресторанов: {str(e)}")
             raise HTTPException(
@@ -67,8 +379,14 @@ class RestaurantCRUD:
         try:
             restaurant = Restaurant(**restaurant.model_dump())
             db.add(restaurant)
+            await db.flush()
+            await rebuild_restaurant_menus(db, restaurant_ids=[restaurant.id])
             await db.commit()
             await db.refresh(restaurant)
+            CacheTagInvalidator.schedule(RESTAURANTS_TAG)
+            await clear_missing(RESTAURANT, restaurant.uuid)
+            await RestaurantFilter.notify_created(restaurant.uuid)
+            await RestaurantSlugMap.set(restaurant.slug, restaurant.id, restaurant.uuid)
             return restaurant
         except Exception as e:
             logger.error(f"Ошибка при создании ресторана: {str(e)}")
@@ -90,6 +408,11 @@ class RestaurantCRUD:
             if db_restaurant:
                 await db.delete(db_restaurant)
                 await db.commit()
+                CacheTagInvalidator.schedule(
+                    restaurant_tag(restaurant_id), RESTAURANTS_TAG
+                )
+                await bump_restaurant_versions(restaurant_uuids=[db_restaurant.uuid])
+                await RestaurantSlugMap.delete(db_restaurant.slug)
                 return True
             return False
         except Exception as e:
@@ -115,10 +438,24 @@ class RestaurantCRUD:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Ресторан не найден.",
                 )
+            old_slug = db_restaurant.slug
             for key, value in updated_restaurant.model_dump().items():
                 setattr(db_restaurant, key, value)
+            # При переименовании slug следует за названием (уникальность - в том же UPDATE)
+            base_slug = db_restaurant.generate_slug()
+            if not slug_matches_name(old_slug, base_slug):
+                db_restaurant.slug = Restaurant.unique_slug(base_slug)
+            await rebuild_restaurant_menus(db, restaurant_ids=[restaurant_id])
             await db.commit()
             await db.refresh(db_restaurant)
+            await RestaurantSlugMap.set(
+                db_restaurant.slug,
+                db_restaurant.id,
+                db_restaurant.uuid,
+                old_slug=old_slug,
+            )
+            CacheTagInvalidator.schedule(restaurant_tag(restaurant_id), RESTAURANTS_TAG)
+            await bump_restaurant_versions(restaurant_uuids=[db_restaurant.uuid])
             return db_restaurant
         except Exception as e:
             logger.error(f"Ошибка при обновлении ресторана: {str(e)}")
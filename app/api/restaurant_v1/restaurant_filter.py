@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+
+from app.core.bloom_filter import BloomFilter
+from app.core.cache_events import CacheEvents
+from app.core.config import settings
+from app.core.models.db_helper import db_helper
+from app.core.models.restaurant_model import Restaurant
+
+logger = logging.getLogger(__name__)
+
+RESTAURANT_CREATED = "restaurant_created"  # Событие создания ресторана
+
+
+class RestaurantFilter:
+    """
+    Фильтр Блума известных UUID ресторанов в памяти воркера.
+
+    Запрос к заведомо несуществующему ресторану отклоняется без обращения к Redis
+    и БД. Новые рестораны добавляются во все воркеры событием через Redis pub/sub,
+    фильтр целиком перестраивается при (пере)подключении к каналу событий и
+    периодически (удаленные рестораны из фильтра уходят только при перестройке).
+    Пока фильтр не построен, пропускаются все UUID.
+    """
+
+    _bloom: Optional[BloomFilter] = None  # Текущий фильтр
+    _added: Optional[set[str]] = None  # UUID, добавленные во время перестройки
+    _task: Optional[asyncio.Task] = None  # Фоновая задача перестройки
+
+    @classmethod
+    def might_exist(cls, restaurant_uuid: UUID | str) -> bool:
+        """Может ли ресторан существовать (False - точно не существует)"""
+        if cls._bloom is None:
+            return True
+        return str(restaurant_uuid) in cls._bloom
+
+    @classmethod
+    def add(cls, restaurant_uuid: UUID | str) -> None:
+        """Добавить UUID в фильтр этого воркера"""
+        if cls._added is not None:
+            cls._added.add(str(restaurant_uuid))
+        if cls._bloom is not None:
+            cls._bloom.add(str(restaurant_uuid))
+
+    @classmethod
+    async def notify_created(cls, restaurant_uuid: UUID) -> None:
+        """Добавить новый ресторан в фильтры всех воркеров"""
+        cls.add(restaurant_uuid)
+        await CacheEvents.publish(RESTAURANT_CREATED, uuid=str(restaurant_uuid))
+
+    @classmethod
+    async def rebuild(cls) -> None:
+        """Перестроить фильтр по всем ресторанам из БД"""
+        cls._added = set()
+        try:
+            async with db_helper.session_factory() as db:
+                result = await db.execute(select(Restaurant.uuid))
+                uuids = [str(restaurant_uuid) for restaurant_uuid in result.scalars()]
+            bloom = BloomFilter.from_items(
+                uuids,
+                capacity=settings.cache.restaurant_filter_capacity,
+                error_rate=settings.cache.restaurant_filter_error_rate,
+            )
+            # Рестораны, созданные во время чтения, могли не попасть в выборку
+            for restaurant_uuid in cls._added:
+                bloom.add(restaurant_uuid)
+            cls._bloom = bloom
+            logger.info(f"Фильтр UUID ресторанов перестроен: {len(uuids)} ресторанов")
+        finally:
+            cls._added = None
+
+    @classmethod
+    def start(cls) -> None:
+        """Подписаться на события и запустить периодическую перестройку"""
+        if not settings.cache.restaurant_filter_enabled or cls._task is not None:
+            return
+        CacheEvents.on(RESTAURANT_CREATED, lambda event: cls.add(event["uuid"]))
+        CacheEvents.on_connect(cls.rebuild)
+        cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Остановить периодическую перестройку"""
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            await asyncio.sleep(settings.cache.restaurant_filter_refresh)
+            try:
+                await cls.rebuild()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ошибка при перестройке фильтра ресторанов: {e}")
+
+
+def reject_unknown_restaurant(restaurant_uuid: UUID) -> None:
+    """404 для UUID, которого точно нет среди ресторанов"""
+    if not RestaurantFilter.might_exist(restaurant_uuid):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ресторан не найден.",
+        )
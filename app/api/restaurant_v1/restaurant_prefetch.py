@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from uuid import UUID
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_TRACKED_VARIANTS = 10_000  # Сколько вариантов меню помнить для эвристики
+
+# Вариант меню: ресторан, размер страницы и фильтр категории
+Variant = tuple[UUID, int, Optional[str]]
+
+
+class MenuPrefetcher:
+    """
+    Фоновое построение следующей страницы меню для бесконечной прокрутки.
+
+    После отдачи страницы N следующая страница строится и кэшируется в фоне,
+    если вариант меню "недавно запрашивался": запрос пришел из ajax-прокрутки
+    или тот же вариант уже открывали за последние `prefetch_window` секунд.
+    Нагрузка ограничена скоростью (token bucket на воркер), числом одновременных
+    построений и дедупликацией одинаковых задач.
+    """
+
+    _recent: OrderedDict[Variant, float] = OrderedDict()  # Вариант -> время запроса
+    _in_flight: dict[str, asyncio.Task] = {}  # Ключ задачи -> фоновая задача
+    _semaphore: Optional[asyncio.Semaphore] = None
+    _tokens: float = 0.0  # Доступные токены скорости
+    _refilled_at: float = 0.0  # Время последнего пополнения токенов
+
+    @classmethod
+    def _touch(cls, variant: Variant, now: float) -> bool:
+        """Отметить запрос варианта. True - вариант запрашивался недавно"""
+        seen_at = cls._recent.pop(variant, None)
+        cls._recent[variant] = now
+        if len(cls._recent) > MAX_TRACKED_VARIANTS:
+            cls._recent.popitem(last=False)
+        return seen_at is not None and now - seen_at < settings.cache.prefetch_window
+
+    @classmethod
+    def _take_token(cls, now: float) -> bool:
+        rate = settings.cache.prefetch_rate
+        cls._tokens = min(rate, cls._tokens + (now - cls._refilled_at) * rate)
+        cls._refilled_at = now
+        if cls._tokens < 1:
+            return False
+        cls._tokens -= 1
+        return True
+
+    @classmethod
+    def schedule_next_page(
+        cls,
+        key: str,
+        restaurant_uuid: UUID,
+        page: int,
+        page_size: int,
+        category_filter: Optional[str],
+        total_pages: int,
+        build: Callable[[int], Awaitable[Any]],
+        is_ajax: bool = False,
+    ) -> None:
+        """
+        Запланировать построение страницы `page + 1`.
+
+        /key: Ключ задачи для дедупликации (ключ кэша следующей страницы).
+        /build: Корутина от номера страницы, строящая и кэширующая ее.
+        """
+        if not settings.cache.prefetch_enabled:
+            return
+        now = time.monotonic()
+        recent = cls._touch((restaurant_uuid, page_size, category_filter), now)
+        if page >= total_pages or not (is_ajax or recent):
+            return
+        if key in cls._in_flight or not cls._take_token(now):
+            return
+        task = asyncio.create_task(cls._run(key, build, page + 1))
+        cls._in_flight[key] = task
+        task.add_done_callback(lambda _: cls._in_flight.pop(key, None))
+
+    @classmethod
+    async def _run(cls, key: str, build: Callable[[int], Awaitable[Any]], page: int):
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(settings.cache.prefetch_concurrency)
+        try:
+            async with cls._semaphore:
+                await build(page)
+        except Exception as e:
+            logger.warning(f"Не удалось заранее построить страницу меню {key}: {e}")
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Отменить незавершенные фоновые построения"""
+        tasks = list(cls._in_flight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,20 +1,53 @@
-import math
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
-from sqlalchemy import select, inspect, func
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    Query,
+    Request,
+    Response,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from redis.asyncio import Redis
-from sqlalchemy.orm import selectinload, joinedload
+from redis.exceptions import RedisError
 
 from app.api.auth_v1.validation_auth_helper import get_superuser_auth
+from app.api.restaurant_v1.restaurant_cache import (
+    STALE_FIELD,
+    get_menu_body,
+    get_restaurant_menu_cached,
+    menu_cache_key,
+    menu_body,
+    menu_body_key,
+    parse_menu_cursor,
+    set_menu_body,
+)
 from app.api.restaurant_v1.restaurant_crud import RestaurantCRUD
-from app.core.models.product_size_model import Portion
-from app.core.models.category_model import Category
-from app.core.models.product_model import Product
+from app.api.restaurant_v1.restaurant_filter import reject_unknown_restaurant
+from app.api.restaurant_v1.restaurant_prefetch import MenuPrefetcher
+from app.api.restaurant_v1.restaurant_slugs import resolve_restaurant_slug
+from app.api.restaurant_v1.restaurant_warming import record_menu_hit
+from app.core.cache_decorator import cached
+from app.core.cache_tags import RESTAURANTS_TAG
+from app.core.cache_versions import get_restaurant_version
+from app.core.config import settings
+from app.core.http_cache import (
+    IDENTITY,
+    accepted_encoding,
+    cache_headers,
+    encoded_response,
+    etag_matches,
+    make_etag,
+    no_store_headers,
+    not_modified,
+    stale_headers,
+)
 from app.core.models.db_helper import db_helper
+from app.core.pagination import DEFAULT_LIMIT, Cursor, Limit
 from app.core.redis import get_redis
-from app.core.redis_utils import cache_get, cache_set, to_dict
+from app.core.single_flight import coalesce
 from app.core.schemas import restaurant_schemas
 
 router = APIRouter(
@@ -27,133 +60,196 @@ router = APIRouter(
 # ========================
 
 
+async def menu_response(
+    request: Request,
+    redis: Redis,
+    restaurant_uuid: UUID,
+    page: int,
+    page_size: int,
+    category_filter: Optional[str],
+    cursor: Optional[str] = None,
+) -> Response:
+    """
+    Страница меню ресторана в JSON с ETag по версии ресторана.
+
+    Тело ответа кэшируется уже сериализованным и сжатым (gzip, br): попадание
+    отдается готовыми байтами с нужным Content-Encoding.
+
+    При недоступной БД отдается резервная копия меню с `stale: true` и
+    заголовком Warning; такой ответ не кэшируется ни в Redis, ни у клиента.
+
+    С курсором (`pagination.next_cursor` предыдущей страницы) страница
+    выбирается по ключу, а не по номеру; предзагрузка для нее не выполняется.
+    """
+    after = parse_menu_cursor(cursor, category_filter) if cursor else None
+    # Заведомо несуществующий UUID отклоняем без обращения к Redis и БД
+    reject_unknown_restaurant(restaurant_uuid)
+    record_menu_hit(restaurant_uuid)
+    encoding = accepted_encoding(request)
+
+    def schedule_prefetch(version: int, total_pages: int) -> None:
+        """Следующую страницу строим заранее, чтобы прокрутка попадала в кэш"""
+        if after is not None:
+            return
+
+        async def build(next_page: int) -> None:
+            next_key = menu_cache_key(
+                restaurant_uuid, version, next_page, page_size, category_filter
+            )
+            # Готовое тело уже в кэше - не сериализуем и не сжимаем его повторно
+            try:
+                if await redis.exists(menu_body_key(next_key)):
+                    return
+            except RedisError:
+                return
+            menu = await get_restaurant_menu_cached(
+                redis=redis,
+                restaurant_uuid=restaurant_uuid,
+                page=next_page,
+                page_size=page_size,
+                category_filter=category_filter,
+                version=version,
+            )
+            if menu.get(STALE_FIELD) or menu["version"] is None:
+                return
+            await set_menu_body(redis, next_key, menu)
+
+        MenuPrefetcher.schedule_next_page(
+            key=menu_cache_key(
+                restaurant_uuid, version, page + 1, page_size, category_filter
+            ),
+            restaurant_uuid=restaurant_uuid,
+            page=page,
+            page_size=page_size,
+            category_filter=category_filter,
+            total_pages=total_pages,
+            build=build,
+        )
+
+    # Содержимое ответа однозначно задается ключом кэша (параметры страницы и
+    # версия ресторана). Клиент уже имеет актуальную версию - отвечаем 304
+    try:
+        version = await get_restaurant_version(redis, restaurant_uuid)
+    except RedisError:
+        version = None  # Версия неизвестна: страница строится из БД без кэша
+    if version is not None:
+        menu_key = menu_cache_key(
+            restaurant_uuid, version, page, page_size, category_filter, after
+        )
+        # Несжатое и сжатые тела - разные представления со своими ETag.
+        # Короткое тело отдается несжатым, поэтому подходит и ETag identity
+        for etag_encoding in dict.fromkeys((encoding, IDENTITY)):
+            etag = make_etag(menu_key, etag_encoding)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
+        cached_body = await get_menu_body(redis, menu_key, encoding)
+        if cached_body is not None:
+            body, body_encoding, total_pages = cached_body
+            schedule_prefetch(version, total_pages)
+            return encoded_response(
+                body, body_encoding, cache_headers(make_etag(menu_key, body_encoding))
+            )
+
+    menu = await get_restaurant_menu_cached(
+        redis=redis,
+        restaurant_uuid=restaurant_uuid,
+        page=page,
+        page_size=page_size,
+        category_filter=category_filter,
+        version=version,
+        after=after,
+    )
+    if menu.get(STALE_FIELD):
+        return encoded_response(menu_body(menu), IDENTITY, stale_headers())
+    if menu["version"] is None:
+        return encoded_response(menu_body(menu), IDENTITY, no_store_headers())
+
+    menu_key = menu_cache_key(
+        restaurant_uuid, menu["version"], page, page_size, category_filter, after
+    )
+    variants = await set_menu_body(redis, menu_key, menu)
+    schedule_prefetch(menu["version"], menu["pagination"]["total_pages"])
+    if encoding not in variants:
+        encoding = IDENTITY
+    return encoded_response(
+        variants[encoding], encoding, cache_headers(make_etag(menu_key, encoding))
+    )
+
+
 @router.get("/restaurant/{restaurant_uuid}/")
 async def get_restaurant_by_uuid_with_products(
+    request: Request,
     restaurant_uuid: UUID,
     page: int = Query(1, ge=1, description="Номер страницы"),
-    page_size: int = Query(1, ge=1, le=25, description="Размер страницы"),
+    page_size: int = Query(
+        settings.menu.default_page_size,
+        ge=1,
+        le=settings.menu.max_page_size,
+        description="Размер страницы",
+    ),
     category_filter: Optional[str] = Query(None, description="Фильтр по категории"),
-    db: AsyncSession = Depends(db_helper.session_getter),
+    cursor: Optional[str] = Query(
+        None, description="Курсор следующей страницы (вместо номера страницы)"
+    ),
     redis: Redis = Depends(get_redis),
 ):
-    # Определяем ключ для кэша
-    cache_key = f"restaurant:{restaurant_uuid}:with_products:{page}:{page_size}:{category_filter}"
-
-    # Проверяем кэш
-    cached_data = await cache_get(redis, cache_key)
-    if cached_data:
-        return cached_data
-
-    # Получаем ресторан
-    db_restaurant = await RestaurantCRUD.get_restaurant_by_uuid(db, restaurant_uuid)
-    if not db_restaurant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ресторан не найден.",
-        )
-
-    # Получаем все категории ресторана
-    categories_query = (
-        select(Category)
-        .join(Product)
-        .where(Product.restaurant_id == db_restaurant.id)
-        .distinct()
-    )
-    categories = await db.execute(categories_query)
-    categories = categories.scalars().all()
-
-    # Базовый запрос продуктов
-    products_query = (
-        select(Product)
-        .options(joinedload(Product.portions))
-        .where(Product.restaurant_id == db_restaurant.id)
+    return await menu_response(
+        request=request,
+        redis=redis,
+        restaurant_uuid=restaurant_uuid,
+        page=page,
+        page_size=page_size,
+        category_filter=category_filter,
+        cursor=cursor,
     )
 
-    # Применяем фильтр по категории, если указан
-    if category_filter:
-        products_query = products_query.join(Category).where(
-            Category.slug == category_filter
-        )
 
-    # Подсчет общего количества продуктов
-    products_query_2 = products_query.subquery()
-    # Создаем запрос для подсчета
-    total_products_query = select(func.count()).select_from(products_query_2)
-    total_products = await db.execute(total_products_query)
-    total_products_count = total_products.scalar_one()
-
-    # Добавляем пагинацию
-    offset = (page - 1) * page_size
-    products_query = products_query.order_by(Product.id).offset(offset).limit(page_size)
-
-    # Получаем продукты
-    products = await db.execute(products_query)
-    products = products.scalars().unique().all()
-
-    # Подготавливаем данные для ответа
-    products_data = []
-    for product in products:
-        product_data = {
-            "id": product.id,
-            "name": product.name,
-            "description": product.description,
-            "image_url": product.image_url,
-            "category": {
-                "id": product.category_id,
-            },
-            "portions": [
-                {
-                    "id": portion.id,
-                    "name": portion.name,
-                    "unit_type": portion.unit_type.value,
-                    "size": portion.size,
-                    "price": portion.price,
-                    "is_available": portion.is_available,
-                }
-                for portion in product.portions
-            ],
-        }
-        products_data.append(product_data)
-    # Проверка, является ли запрос AJAX
-
-    response_data = {
-        "restaurant": to_dict(db_restaurant),
-        "categories": [
-            {"id": cat.id, "name": cat.name, "slug": cat.slug} for cat in categories
-        ],
-        "products": products_data,
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total_products": total_products_count,
-            "total_pages": math.ceil(total_products_count / page_size),
-            "current_category": category_filter,
-        },
-    }
-
-    # Кэшируем результат
-    await cache_set(redis=redis, key=cache_key, value=response_data)
-    return response_data
+@router.get("/r/{slug}/")
+async def get_restaurant_by_slug_with_products(
+    request: Request,
+    slug: str,
+    page: int = Query(1, ge=1, description="Номер страницы"),
+    page_size: int = Query(
+        settings.menu.default_page_size,
+        ge=1,
+        le=settings.menu.max_page_size,
+        description="Размер страницы",
+    ),
+    category_filter: Optional[str] = Query(None, description="Фильтр по категории"),
+    cursor: Optional[str] = Query(
+        None, description="Курсор следующей страницы (вместо номера страницы)"
+    ),
+    redis: Redis = Depends(get_redis),
+):
+    """Страница меню ресторана по slug"""
+    return await menu_response(
+        request=request,
+        redis=redis,
+        restaurant_uuid=await resolve_restaurant_slug(redis, slug),
+        page=page,
+        page_size=page_size,
+        category_filter=category_filter,
+        cursor=cursor,
+    )
 
 
 @router.get(
     "/restaurants/",
 )
+@coalesce
+@cached("restaurants:{is_active}:{owner_id}:{cursor}:{limit}", tags=(RESTAURANTS_TAG,))
 async def get_all_restaurants(
     db: AsyncSession = Depends(db_helper.session_getter),
-    redis: Redis = Depends(get_redis),
+    cursor: Cursor = None,
+    limit: Limit = DEFAULT_LIMIT,
+    is_active: Optional[bool] = Query(None, description="Фильтр по активности"),
+    owner_id: Optional[int] = Query(None, description="Фильтр по владельцу"),
 ):
-    # # Определяем ключ для кэша
-    # cache_key = "all_restaurants_routes"
-    # # Проверяем кэш
-    # cached_data = await cache_get(redis, cache_key)
-    # if cached_data:
-    #     return cached_data
-    # Если кэш пустой, запрашиваем данные из базы данных
-    restaurants = await RestaurantCRUD.get_all_restaurants(db=db)
-    # # Добавляем данные в кэш
-    # await cache_set(redis, cache_key, restaurants)
-    return restaurants
+    """Список ресторанов с курсорной пагинацией (схема CursorPage)"""
+    return await RestaurantCRUD.get_all_restaurants(
+        db=db, cursor=cursor, limit=limit, is_active=is_active, owner_id=owner_id
+    )
 
 
 @router.post("/", dependencies=[Depends(get_superuser_auth)])
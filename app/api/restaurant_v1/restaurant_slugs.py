@@ -0,0 +1,122 @@
+import logging
+import re
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import select
+
+from app.core.local_cache import local_cache
+from app.core.models.db_helper import db_helper
+from app.core.models.restaurant_model import Restaurant
+from app.core.negative_cache import (
+    RESTAURANT_SLUG,
+    clear_missing,
+    is_missing,
+    mark_missing,
+)
+from app.core.redis import RedisClient, get_settings
+
+logger = logging.getLogger(__name__)
+
+SLUG_MAP_KEY = "restaurant:slug_map"  # Хеш Redis: slug -> "id:uuid"
+SLUG_LOCAL_PREFIX = "restaurant:slug:"  # Префикс записей L1-кэша для slug
+
+
+def _local_key(slug: str) -> str:
+    return f"{SLUG_LOCAL_PREFIX}{slug}"
+
+
+def slug_matches_name(slug: str, base: str) -> bool:
+    """Соответствует ли slug базовому slug названия (в том числе с номером base-N)"""
+    return slug == base or re.fullmatch(rf"{re.escape(base)}-\d+", slug) is not None
+
+
+class RestaurantSlugMap:
+    """
+    Кэш соответствия slug -> (id, uuid) ресторана в хеше Redis и L1-кэше воркера.
+
+    Хеш заполняется лениво при первом обращении к slug и обновляется при создании,
+    переименовании и удалении ресторана. Неизвестные slug кэшируются негативно.
+    """
+
+    @staticmethod
+    async def resolve(redis: Redis, slug: str) -> Optional[tuple[int, UUID]]:
+        """(id, uuid) ресторана по slug или None"""
+        resolved = local_cache.get(_local_key(slug))
+        if resolved is not None:
+            return resolved
+
+        raw = None
+        try:
+            raw = await redis.hget(SLUG_MAP_KEY, slug)
+        except RedisError as e:
+            logger.error(f"Ошибка при чтении slug {slug} из Redis: {e}")
+        if raw is not None:
+            restaurant_id, restaurant_uuid = raw.decode().split(":", 1)
+            resolved = (int(restaurant_id), UUID(restaurant_uuid))
+        else:
+            if await is_missing(redis, RESTAURANT_SLUG, slug):
+                return None
+            async with db_helper.session_factory() as db:
+                row = (
+                    await db.execute(
+                        select(Restaurant.id, Restaurant.uuid).where(
+                            Restaurant.slug == slug
+                        )
+                    )
+                ).one_or_none()
+            if row is None:
+                await mark_missing(redis, RESTAURANT_SLUG, slug)
+                return None
+            resolved = (row.id, row.uuid)
+            await RestaurantSlugMap.set(slug, *resolved, redis=redis)
+
+        local_cache.set(_local_key(slug), resolved, size=len(slug) + 64)
+        return resolved
+
+    @staticmethod
+    async def set(
+        slug: str,
+        restaurant_id: int,
+        restaurant_uuid: UUID,
+        old_slug: Optional[str] = None,
+        redis: Optional[Redis] = None,
+    ) -> None:
+        """Записать slug ресторана (и удалить прежний при переименовании)"""
+        local_cache.delete(_local_key(slug))
+        try:
+            redis = redis or await RedisClient.get_client(get_settings())
+            pipe = redis.pipeline(transaction=True)
+            if old_slug and old_slug != slug:
+                pipe.hdel(SLUG_MAP_KEY, old_slug)
+            pipe.hset(SLUG_MAP_KEY, slug, f"{restaurant_id}:{restaurant_uuid}")
+            await pipe.execute()
+        except RedisError as e:
+            logger.error(f"Ошибка при записи slug {slug} в Redis: {e}")
+        if old_slug and old_slug != slug:
+            local_cache.delete(_local_key(old_slug))
+        await clear_missing(RESTAURANT_SLUG, slug)
+
+    @staticmethod
+    async def delete(slug: str) -> None:
+        """Удалить slug ресторана"""
+        local_cache.delete(_local_key(slug))
+        try:
+            redis = await RedisClient.get_client(get_settings())
+            await redis.hdel(SLUG_MAP_KEY, slug)
+        except RedisError as e:
+            logger.error(f"Ошибка при удалении slug {slug} из Redis: {e}")
+
+
+async def resolve_restaurant_slug(redis: Redis, slug: str) -> UUID:
+    """UUID ресторана по slug, 404 - если такого slug нет"""
+    resolved = await RestaurantSlugMap.resolve(redis, slug)
+    if resolved is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ресторан не найден.",
+        )
+    return resolved[1]
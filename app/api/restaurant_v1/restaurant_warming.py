@@ -0,0 +1,193 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import select
+
+from app.api.restaurant_v1.restaurant_cache import (
+    get_restaurant_menu_cached,
+    menu_cache_key,
+)
+from app.core.cache_lock import fresh_value
+from app.core.cache_versions import get_restaurant_versions
+from app.core.config import settings
+from app.core.models.db_helper import db_helper
+from app.core.models.restaurant_model import Restaurant
+from app.core.redis import RedisClient, get_settings
+from app.core.redis_utils import cache_get_many
+
+logger = logging.getLogger(__name__)
+
+TRAFFIC_KEY = "cache:traffic:restaurants"  # Рейтинг ресторанов по недавнему трафику
+WARMING_LOCK_KEY = "cache:warming:lock"  # Один прогрев на кластер за цикл
+
+# Обращения к меню, накопленные воркером с последней выгрузки в Redis
+_menu_hits: Counter = Counter()
+
+
+def record_menu_hit(restaurant_uuid: UUID) -> None:
+    """Учесть обращение к меню ресторана (без обращения к Redis)"""
+    _menu_hits[str(restaurant_uuid)] += 1
+
+
+class MenuCacheWarmer:
+    """
+    Прогрев кэша меню активных ресторанов при старте и периодически.
+
+    Рестораны прогреваются в порядке недавнего трафика, число одновременных
+    построений страниц ограничено `settings.cache.warm_concurrency`, поэтому
+    прогрев не забирает у живых запросов соединения пула БД. Уже свежие страницы
+    определяются заранее одним MGET и не запрашиваются по одной.
+    """
+
+    _task: Optional[asyncio.Task] = None  # Фоновая задача прогрева
+
+    @classmethod
+    def start(cls) -> None:
+        """Запустить фоновый прогрев"""
+        if settings.cache.warm_enabled and cls._task is None:
+            cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Остановить фоновый прогрев"""
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def _run(cls) -> None:
+        await asyncio.sleep(settings.cache.warm_startup_delay)
+        while True:
+            try:
+                await cls.flush_traffic()
+                await cls.warm()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ошибка при прогреве кэша меню: {e}")
+            await asyncio.sleep(settings.cache.warm_interval)
+
+    @classmethod
+    async def flush_traffic(cls) -> None:
+        """Выгрузить накопленные воркером обращения в общий рейтинг Redis"""
+        if not _menu_hits:
+            return
+        hits = dict(_menu_hits)
+        _menu_hits.clear()
+        redis = await RedisClient.get_client(get_settings())
+        pipe = redis.pipeline(transaction=False)
+        for restaurant_uuid, count in hits.items():
+            pipe.zincrby(TRAFFIC_KEY, count, restaurant_uuid)
+        await pipe.execute()
+
+    @classmethod
+    async def fresh_pages(
+        cls, redis: Redis, restaurant_uuids: list[UUID]
+    ) -> dict[tuple[UUID, int], dict]:
+        """Свежие страницы прогрева в кэше: (uuid, страница) -> меню"""
+        versions = await get_restaurant_versions(redis, restaurant_uuids)
+        keys = {
+            (restaurant_uuid, page): menu_cache_key(
+                restaurant_uuid, version, page, settings.cache.warm_page_size, None
+            )
+            for restaurant_uuid, version in versions.items()
+            if version is not None
+            for page in range(1, settings.cache.warm_pages + 1)
+        }
+        entries = await cache_get_many(redis, list(keys.values()), use_local=False)
+        pages = {}
+        for page_key, entry in zip(keys, entries):
+            menu = fresh_value(entry)
+            if menu is not None:
+                pages[page_key] = menu
+        return pages
+
+    @classmethod
+    async def warm(cls) -> int:
+        """Прогреть первые страницы меню активных ресторанов. Возвращает число страниц"""
+        redis = await RedisClient.get_client(get_settings())
+        try:
+            acquired = await redis.set(
+                WARMING_LOCK_KEY, 1, nx=True, ex=settings.cache.warm_interval
+            )
+        except RedisError as e:
+            logger.warning(f"Прогрев кэша пропущен, Redis недоступен: {e}")
+            return 0
+        if not acquired:
+            return 0  # В этом цикле прогрев выполняет другой воркер
+
+        # Старый трафик постепенно теряет вес, угасший удаляется, а размер
+        # рейтинга ограничен: читается только его верх
+        pipe = redis.pipeline(transaction=True)
+        pipe.zunionstore(TRAFFIC_KEY, {TRAFFIC_KEY: settings.cache.warm_traffic_decay})
+        pipe.zremrangebyscore(
+            TRAFFIC_KEY, "-inf", f"({settings.cache.warm_traffic_min_score}"
+        )
+        pipe.zremrangebyrank(
+            TRAFFIC_KEY, 0, -settings.cache.warm_traffic_max_members - 1
+        )
+        pipe.zrevrange(
+            TRAFFIC_KEY, 0, settings.cache.warm_max_restaurants - 1, withscores=True
+        )
+        *_, top = await pipe.execute()
+        scores = dict(top)
+
+        async with db_helper.session_factory() as db:
+            result = await db.execute(
+                select(Restaurant.uuid).where(Restaurant.is_active.is_(True))
+            )
+            restaurant_uuids = result.scalars().all()
+
+        restaurant_uuids = sorted(
+            restaurant_uuids,
+            key=lambda restaurant_uuid: scores.get(str(restaurant_uuid).encode(), 0),
+            reverse=True,
+        )[: settings.cache.warm_max_restaurants]
+        fresh = await cls.fresh_pages(redis, restaurant_uuids)
+
+        semaphore = asyncio.Semaphore(settings.cache.warm_concurrency)
+
+        async def warm_page(restaurant_uuid: UUID, page: int) -> Optional[dict]:
+            menu = fresh.get((restaurant_uuid, page))
+            if menu is not None:
+                return menu  # Страница уже в кэше и не требует обновления
+            async with semaphore:
+                try:
+                    return await get_restaurant_menu_cached(
+                        redis=redis,
+                        restaurant_uuid=restaurant_uuid,
+                        page=page,
+                        page_size=settings.cache.warm_page_size,
+                    )
+                except HTTPException:
+                    return None  # Ресторан удален между запросами
+
+        async def warm_restaurant(restaurant_uuid: UUID) -> int:
+            first_page = await warm_page(restaurant_uuid, 1)
+            if first_page is None:
+                return 0
+            last_page = min(
+                settings.cache.warm_pages, first_page["pagination"]["total_pages"]
+            )
+            await asyncio.gather(
+                *(warm_page(restaurant_uuid, page) for page in range(2, last_page + 1))
+            )
+            return max(last_page, 1)
+
+        warmed = sum(
+            await asyncio.gather(*(warm_restaurant(uuid) for uuid in restaurant_uuids))
+        )
+        logger.info(
+            f"Прогрев кэша меню: рестораны={len(restaurant_uuids)}, страницы={warmed}"
+        )
+        return warmed
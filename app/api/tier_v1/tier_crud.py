@@ -1,29 +1,28 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import update, delete
 from datetime import datetime, UTC
 from fastapi import HTTPException, status
 from typing import List, Optional
+from ...core.cache_tags import TIERS_TAG, CacheTagInvalidator
 from ...core.models import Tier
+from ...core.reference_data import ReferenceData
 from ...core.schemas.tier_schemas import TierCreate, TierUpdate
 
 
 class CRUDTier:
     async def get_tiers(
-        self, db: AsyncSession, skip: int = 0, limit: int = 100
-    ) -> List[Tier]:
-        """Получение списка уровней с разбивкой на страницы"""
-        result = await db.execute(select(Tier).offset(skip).limit(limit))
-        return list(result.scalars().all())
+        self, db: AsyncSession, cursor: Optional[str], limit: int
+    ) -> dict:
+        """Получение страницы уровней (курсорная пагинация)"""
+        return await ReferenceData.get_tiers(db, cursor=cursor, limit=limit)
 
     async def get_tier(self, db: AsyncSession, tier_id: int) -> Tier:
         """Получение уровня по ID"""
-        result = await db.execute(select(Tier).where(Tier.id == tier_id))
-        return result.scalar_one_or_none()
+        return await ReferenceData.get_tier(db, tier_id)
 
     async def get_tier_by_name(self, db: AsyncSession, name: str) -> Optional[Tier]:
         """Получение уровня по имени"""
-        result = await db.execute(select(Tier).where(Tier.name == name))
-        return result.scalar_one_or_none()
+        return await ReferenceData.get_tier_by_name(db, name)
 
     async def create_tier(self, db: AsyncSession, tier_in: TierCreate) -> Tier:
         """Создание нового уровня"""
@@ -40,6 +39,8 @@ class CRUDTier:
         db.add(db_tier)
         await db.commit()
         await db.refresh(db_tier)
+        CacheTagInvalidator.schedule(TIERS_TAG)
+        await ReferenceData.notify_changed()
         return db_tier
 
     async def update_tier(
@@ -73,6 +74,8 @@ class CRUDTier:
         result = await db.execute(query)
         updated_tier = result.scalar_one()
         await db.commit()
+        CacheTagInvalidator.schedule(TIERS_TAG)
+        await ReferenceData.notify_changed()
 
         return updated_tier
 
@@ -89,6 +92,8 @@ class CRUDTier:
         # Удаляем уровень из БД
         await db.execute(delete(Tier).where(Tier.id == tier_id))
         await db.commit()
+        CacheTagInvalidator.schedule(TIERS_TAG)
+        await ReferenceData.notify_changed()
 
 
 # Создаем экземпляр класса
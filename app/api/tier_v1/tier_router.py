@@ -7,8 +7,12 @@ from app.api.auth_v1.validation_auth_helper import (
     get_superuser_auth,
 )
 from app.api.tier_v1.tier_crud import tier_crud
+from app.core.cache_decorator import cached
+from app.core.cache_tags import TIERS_TAG
 from app.core.models import db_helper
+from app.core.pagination import DEFAULT_LIMIT, Cursor, Limit
 from app.core.schemas import tier_schemas
+from app.core.schemas.base_schemas import CursorPage
 
 router = APIRouter(
     tags=["Tiers"],
@@ -17,16 +21,21 @@ router = APIRouter(
 
 @router.get(
     "",
-    response_model=list[tier_schemas.TierRead],
+    response_model=CursorPage[tier_schemas.TierRead],
     dependencies=[Depends(get_superuser_auth)],
 )
+@cached(
+    "tiers:{cursor}:{limit}",
+    tags=(TIERS_TAG,),
+    response_model=CursorPage[tier_schemas.TierRead],
+)
 async def get_all_tiers(
     db: Annotated[AsyncSession, Depends(db_helper.session_getter)],
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Cursor = None,
+    limit: Limit = DEFAULT_LIMIT,
 ):
-    """Получение списка уровней с разбивкой на страницы"""
-    return await tier_crud.get_tiers(db=db, skip=skip, limit=limit)
+    """Получение списка уровней с курсорной пагинацией"""
+    return await tier_crud.get_tiers(db=db, cursor=cursor, limit=limit)
 
 
 @router.get(
@@ -34,6 +43,7 @@ async def get_all_tiers(
     response_model=tier_schemas.TierRead,
     dependencies=[Depends(get_superuser_auth)],
 )
+@cached("tier:{tier_id}", tags=(TIERS_TAG,), response_model=tier_schemas.TierRead)
 async def get_one_tier(
     tier_id: int, db: Annotated[AsyncSession, Depends(db_helper.session_getter)]
 ):
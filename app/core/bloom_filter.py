@@ -0,0 +1,51 @@
+import hashlib
+import math
+from typing import Iterable
+
+# ========================
+# Фильтр Блума
+# ========================
+
+
+class BloomFilter:
+    """
+    Компактное вероятностное множество: `in` может ошибиться только в сторону
+    "есть" (с долей `error_rate`), но никогда не пропускает добавленный элемент.
+    Удаление не поддерживается - фильтр перестраивается целиком.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )  # Число бит
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))  # Число хешей
+        self.bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_items(
+        cls, items: Iterable[str], capacity: int, error_rate: float = 0.001
+    ) -> "BloomFilter":
+        """Построить фильтр из элементов"""
+        items = list(items)
+        bloom = cls(max(capacity, len(items) * 2), error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Двойное хеширование: k позиций из двух 64-битных половин одного хеша
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
@@ -0,0 +1,148 @@
+import functools
+import hashlib
+import inspect
+import logging
+from typing import Any, Callable, Iterable, Optional, Union
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
+
+from app.core.redis import RedisClient, get_settings
+from app.core.redis_utils import cache_get, cache_set, to_dict
+
+logger = logging.getLogger(__name__)
+
+# Тег - шаблон строки по параметрам роута или функция от закэшированного значения
+TagSpec = Union[str, Callable[[Any], Iterable[str]]]
+
+# Имя параметра, добавляемого в сигнатуру роута для кэша с областью пользователя
+REQUEST_PARAM = "_cache_request"
+
+# ========================
+# Декоратор кэширования роутов
+# ========================
+
+
+def _to_plain(value: Any) -> Any:
+    """Заменить SQLAlchemy-модели словарями колонок (рекурсивно в списках и словарях)"""
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_plain(item) for key, item in value.items()}
+    if hasattr(value, "_sa_instance_state"):
+        return to_dict(value)
+    return value
+
+
+def user_scope_key(request: Optional[Request]) -> str:
+    """Область кэша пользователя: хеш заголовка Authorization (сам токен в ключ не попадает)"""
+    authorization = request.headers.get("Authorization") if request else None
+    if not authorization:
+        return "anonymous"
+    return hashlib.blake2b(authorization.encode(), digest_size=12).hexdigest()
+
+
+def cached(
+    key: str,
+    expire: int = 300,
+    tags: Iterable[TagSpec] = (),
+    response_model: Any = None,
+    user_scope: bool = False,
+):
+    """
+    Кэширование ответа асинхронного роута в Redis.
+
+    Ключ и строковые теги - шаблоны str.format по параметрам роута, например
+    `@cached("portions:product:{product_id}", tags=(product_tag("{product_id}"),))`.
+    В кэш попадает JSON-совместимое значение: через `response_model` (с чтением
+    атрибутов ORM-объектов) или, без него, через `jsonable_encoder` со словарями
+    колонок вместо SQLAlchemy-моделей. Это же значение возвращается роутом,
+    поэтому ответ при попадании и промахе одинаков.
+
+    Декоратор ставится под `@router.get(...)`: зависимости роута (в том числе
+    проверка прав) выполняются до обращения к кэшу. None и Response не кэшируются.
+
+    /user_scope: Отдельная запись на каждого пользователя (по заголовку Authorization).
+    """
+    adapter = TypeAdapter(response_model) if response_model is not None else None
+
+    def serialize(result: Any) -> Any:
+        if adapter is not None:
+            model = adapter.validate_python(result, from_attributes=True)
+            return adapter.dump_python(model, mode="json")
+        return jsonable_encoder(_to_plain(result))
+
+    def resolve_tags(value: Any, arguments: dict) -> list[str]:
+        resolved = []
+        for tag in tags:
+            if callable(tag):
+                resolved.extend(tag(value))
+            else:
+                resolved.append(tag.format(**arguments))
+        return resolved
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        request_param = next(
+            (
+                name
+                for name, parameter in signature.parameters.items()
+                if parameter.annotation is Request
+            ),
+            None,
+        )
+        # Роуту без параметра Request он добавляется, чтобы FastAPI передал запрос
+        inject_request = user_scope and request_param is None
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            request = kwargs.pop(REQUEST_PARAM, None) if inject_request else None
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            if request_param is not None:
+                request = arguments[request_param]
+
+            cache_key = key.format(**arguments)
+            if user_scope:
+                cache_key = f"{cache_key}:user:{user_scope_key(request)}"
+
+            try:
+                redis = await RedisClient.get_client(get_settings())
+            except (RedisError, OSError) as e:
+                logger.warning(f"Кэш роута {cache_key} недоступен: {e}")
+                return await func(*args, **kwargs)
+
+            cached_value = await cache_get(redis, cache_key)
+            if cached_value is not None:
+                return cached_value
+
+            result = await func(*args, **kwargs)
+            if result is None or isinstance(result, Response):
+                return result
+            value = serialize(result)
+            await cache_set(
+                redis=redis,
+                key=cache_key,
+                value=value,
+                expire=expire,
+                tags=resolve_tags(value, arguments),
+            )
+            return value
+
+        if inject_request:
+            wrapper.__signature__ = signature.replace(
+                parameters=[
+                    *signature.parameters.values(),
+                    inspect.Parameter(
+                        REQUEST_PARAM,
+                        inspect.Parameter.KEYWORD_ONLY,
+                        annotation=Request,
+                    ),
+                ]
+            )
+        return wrapper
+
+    return decorator
@@ -0,0 +1,100 @@
+import asyncio
+import inspect
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Optional
+
+import orjson
+from redis.exceptions import RedisError
+
+from app.core.redis import RedisClient, get_settings
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "cache:events"  # Канал Redis pub/sub для событий кэша между воркерами
+RECONNECT_DELAY = 1.0  # Пауза перед переподключением к каналу (сек.)
+
+Handler = Callable[[dict], Any]
+
+
+class CacheEvents:
+    """
+    События кэша между воркерами через Redis pub/sub.
+
+    Событие получают все воркеры, включая отправителя. Pub/sub не хранит
+    сообщения, поэтому после каждого (пере)подключения вызываются обработчики
+    `on_connect`: они заново синхронизируют состояние, пропущенное за разрыв.
+    """
+
+    _handlers: dict[str, list[Handler]] = defaultdict(list)  # Обработчики событий
+    _connect_handlers: list[Callable[[], Any]] = []  # Обработчики подключения
+    _task: Optional[asyncio.Task] = None  # Фоновая задача слушателя
+
+    @classmethod
+    def on(cls, event: str, handler: Handler) -> None:
+        """Подписать обработчик (функцию или корутину от данных события) на событие"""
+        cls._handlers[event].append(handler)
+
+    @classmethod
+    def on_connect(cls, handler: Callable[[], Any]) -> None:
+        """Подписать обработчик на (пере)подключение к каналу"""
+        cls._connect_handlers.append(handler)
+
+    @classmethod
+    async def publish(cls, event: str, **data: Any) -> None:
+        """Отправить событие всем воркерам"""
+        message = orjson.dumps({"event": event, **data})
+        try:
+            redis = await RedisClient.get_client(get_settings())
+            await redis.publish(EVENTS_CHANNEL, message)
+        except RedisError as e:
+            logger.error(f"Не удалось отправить событие кэша {event}: {e}")
+
+    @classmethod
+    def start(cls) -> None:
+        """Запустить слушателя событий"""
+        if cls._task is None:
+            cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Остановить слушателя событий"""
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def _call(cls, handler: Callable, *args: Any) -> None:
+        try:
+            result = handler(*args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(f"Ошибка в обработчике события кэша {handler}: {e}")
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            pubsub = None
+            try:
+                redis = await RedisClient.get_client(get_settings())
+                pubsub = redis.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(EVENTS_CHANNEL)
+                for handler in cls._connect_handlers:
+                    await cls._call(handler)
+                async for message in pubsub.listen():
+                    data = orjson.loads(message["data"])
+                    for handler in cls._handlers.get(data.get("event"), ()):
+                        await cls._call(handler, data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Слушатель событий кэша отключился: {e}")
+            finally:
+                if pubsub is not None:
+                    await pubsub.aclose()
+            await asyncio.sleep(RECONNECT_DELAY)
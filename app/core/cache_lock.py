@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Iterable, Optional, Union
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.cache_metrics import cache_metrics, key_family
+from app.core.config import settings
+from app.core.redis_utils import cache_get, cache_set
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY_PREFIX = "cache:lock:"  # Префикс ключей блокировок заполнения кэша
+
+# Снимаем блокировку, только если она все еще принадлежит нам
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+Loader = Callable[[], Awaitable[Any]]
+Tags = Union[Iterable[str], Callable[[Any], Iterable[str]]]
+
+# Фоновые обновления устаревших записей (stale-while-revalidate) по ключам кэша
+_refresh_tasks: dict[str, asyncio.Task] = {}
+
+
+def fresh_value(cached: Any) -> Any:
+    """Значение записи с мягким TTL (stale_ttl > 0), если она еще свежая, иначе None"""
+    if cached is None or time.time() >= cached["fresh_until"]:
+        return None
+    return cached["value"]
+
+
+def lock_key(key: str) -> str:
+    """Ключ блокировки заполнения для ключа кэша"""
+    return f"{LOCK_KEY_PREFIX}{key}"
+
+
+async def acquire_lock(redis: Redis, key: str, ttl: float) -> Optional[str]:
+    """Захватить блокировку заполнения ключа. Возвращает токен владельца или None"""
+    token = uuid.uuid4().hex
+    acquired = await redis.set(lock_key(key), token, nx=True, px=int(ttl * 1000))
+    return token if acquired else None
+
+
+async def release_lock(redis: Redis, key: str, token: str) -> None:
+    """Освободить блокировку, если она принадлежит владельцу токена"""
+    try:
+        await redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key(key), token)
+    except RedisError as e:
+        # Блокировка все равно истечет по TTL
+        logger.warning(f"Не удалось снять блокировку кэша {key}: {e}")
+
+
+async def _fill(
+    redis: Redis,
+    key: str,
+    loader: Loader,
+    expire: int,
+    tags: Tags,
+    stale_ttl: int = 0,
+) -> Any:
+    """
+    Построить значение и сохранить его в кэш.
+
+    При `stale_ttl > 0` значение хранится в обертке с моментом окончания свежести:
+    запись живет в Redis `expire + stale_ttl` секунд (жесткий TTL), но свежей
+    считается только первые `expire` секунд (мягкий TTL).
+    """
+    family = key_family(key)
+    with cache_metrics.timer("cache_fill_seconds", family=family):
+        value = await loader()
+    cache_metrics.inc("cache_fills_total", family=family)
+    if value is not None:
+        cached = value
+        if stale_ttl:
+            cached = {"value": value, "fresh_until": time.time() + expire}
+        await cache_set(
+            redis=redis,
+            key=key,
+            value=cached,
+            expire=expire + stale_ttl,
+            tags=tags(value) if callable(tags) else tags,
+        )
+    return value
+
+
+async def _refresh(
+    redis: Redis, key: str, loader: Loader, expire: int, tags: Tags, stale_ttl: int
+) -> None:
+    """Фоновое обновление устаревшей записи. Выполняется одним воркером на ключ"""
+    try:
+        token = await acquire_lock(redis, key, settings.cache.lock_ttl)
+        if token is None:
+            return  # Запись уже обновляет другой воркер или узел
+        try:
+            # L1 мог отдать устаревшую запись, которую другой узел уже обновил
+            cached = await cache_get(redis, key, use_local=False)
+            if cached is not None and time.time() < cached["fresh_until"]:
+                return
+            await _fill(redis, key, loader, expire, tags, stale_ttl)
+        finally:
+            await release_lock(redis, key, token)
+    except Exception as e:
+        logger.error(f"Ошибка фонового обновления кэша {key}: {e}")
+
+
+def _schedule_refresh(
+    redis: Redis, key: str, loader: Loader, expire: int, tags: Tags, stale_ttl: int
+) -> None:
+    """Запланировать фоновое обновление, если для ключа оно еще не запущено"""
+    task = _refresh_tasks.get(key)
+    if task is not None and not task.done():
+        return
+    task = asyncio.create_task(_refresh(redis, key, loader, expire, tags, stale_ttl))
+    _refresh_tasks[key] = task
+    task.add_done_callback(lambda _: _refresh_tasks.pop(key, None))
+
+
+async def cache_get_or_set(
+    redis: Redis,
+    key: str,
+    loader: Loader,
+    expire: int = 300,
+    tags: Tags = (),
+    lock_ttl: Optional[float] = None,
+    wait_timeout: Optional[float] = None,
+    stale_ttl: int = 0,
+) -> Any:
+    """
+    Получить значение из кэша, а при промахе построить его с защитой от "stampede".
+
+    Заполнение ключа выполняет только владелец блокировки в Redis (один на все
+    воркеры и узлы), остальные ждут появления значения не дольше `wait_timeout`.
+    Если за это время значение не появилось или владелец завершился с ошибкой,
+    ожидающий строит значение сам - запрос никогда не висит дольше ограничения.
+
+    При `stale_ttl > 0` включается режим stale-while-revalidate: после `expire`
+    секунд запись еще `stale_ttl` секунд отдается сразу, а новое значение строится
+    фоновой задачей (одной на ключ в воркере и одной на ключ в кластере).
+
+    /loader: Асинхронная функция без аргументов, строящая значение (открывает свою сессию БД).
+    /tags: Теги записи или функция, вычисляющая теги по построенному значению.
+    """
+    lock_ttl = settings.cache.lock_ttl if lock_ttl is None else lock_ttl
+    wait_timeout = (
+        settings.cache.lock_wait_timeout if wait_timeout is None else wait_timeout
+    )
+
+    def unwrap(cached: Any) -> Any:
+        """Достать значение из записи, при устаревании запланировать обновление"""
+        if not stale_ttl:
+            return cached
+        if time.time() >= cached["fresh_until"]:
+            # Попадание уже учтено в cache_get, здесь - доля устаревших отдач
+            cache_metrics.inc("cache_stale_total", family=key_family(key))
+            _schedule_refresh(redis, key, loader, expire, tags, stale_ttl)
+        return cached["value"]
+
+    cached = await cache_get(redis, key)
+    if cached is not None:
+        return unwrap(cached)
+
+    try:
+        token = await acquire_lock(redis, key, lock_ttl)
+    except RedisError as e:
+        logger.warning(f"Не удалось захватить блокировку кэша {key}: {e}")
+        return await loader()
+
+    if token is not None:
+        try:
+            # Ключ мог быть заполнен между промахом и захватом блокировки
+            cached = await cache_get(redis, key)
+            if cached is not None:
+                return unwrap(cached)
+            return await _fill(redis, key, loader, expire, tags, stale_ttl)
+        finally:
+            await release_lock(redis, key, token)
+
+    # Блокировка у другого воркера - ждем его результат с ограничением по времени
+    deadline = time.monotonic() + wait_timeout
+    delay = 0.02
+    while time.monotonic() < deadline:
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.2)
+        cached = await cache_get(redis, key)
+        if cached is not None:
+            return unwrap(cached)
+        try:
+            if not await redis.exists(lock_key(key)):
+                break  # Владелец завершился, не заполнив ключ
+        except RedisError as e:
+            logger.warning(f"Не удалось проверить блокировку кэша {key}: {e}")
+            break
+
+    logger.info(f"Не дождались заполнения кэша {key}, строим значение самостоятельно")
+    return await _fill(redis, key, loader, expire, tags, stale_ttl)
@@ -0,0 +1,149 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Iterator
+
+# ========================
+# Метрики кэша по семействам ключей
+# ========================
+#
+# Метрики собираются в памяти воркера и отдаются в текстовом формате Prometheus.
+# Семейство ключа - ключ без переменных частей: "restaurant:<uuid>:with_products:1:1:None"
+# относится к семейству "restaurant:*:with_products".
+
+# Границы корзин гистограмм задержек (секунды)
+LATENCY_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+# Постоянные сегменты ключей после первого; остальные (UUID, ID, курсоры,
+# фильтры, хосты) считаются переменными, чтобы число семейств было ограничено
+CONSTANT_SEGMENTS = frozenset(
+    {
+        "with_products",
+        "menu_count",
+        "menu_fallback",
+        "missing",
+        "restaurant",
+        "product",
+        "slug",
+        "index",
+        "menu",
+        "lock",
+        "tag",
+        "version",
+    }
+)
+
+
+def key_family(key: str | bytes) -> str:
+    """
+    Семейство ключа: сегменты до второго постоянного, переменные заменены на "*".
+    Например, "restaurant:*:with_products", "html:index", "tiers:*:*".
+    """
+    if isinstance(key, bytes):
+        key = key.decode()
+    first, *segments = key.split(":")
+    family = [first]
+    constant = 1
+    for segment in segments:
+        if segment in CONSTANT_SEGMENTS:
+            family.append(segment)
+            constant += 1
+        else:
+            family.append("*")
+        if constant == 2 or len(family) == 3:
+            break
+    return ":".join(family)
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами"""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Последняя корзина - +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class CacheMetrics:
+    """Счетчики и гистограммы кэша в памяти воркера"""
+
+    def __init__(self):
+        # (имя метрики, метки) -> значение
+        self.counters: defaultdict[tuple[str, tuple], float] = defaultdict(float)
+        self.histograms: dict[tuple[str, tuple], Histogram] = {}
+        self.gauges: dict[tuple[str, tuple], float] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """Увеличить счетчик"""
+        self.counters[(name, tuple(sorted(labels.items())))] += value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Добавить наблюдение в гистограмму"""
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(value)
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """Установить значение показателя"""
+        self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """Замерить длительность блока и добавить ее в гистограмму"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def render(self) -> str:
+        """Метрики в текстовом формате Prometheus"""
+        lines = []
+        for (name, labels), value in sorted(self.counters.items()):
+            lines.append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), value in sorted(self.gauges.items()):
+            lines.append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            cumulative = 0
+            for bound, count in zip(
+                (*histogram.buckets, "+Inf"), histogram.counts, strict=True
+            ):
+                cumulative += count
+                bucket_labels = (*labels, ("le", str(bound)))
+                lines.append(f"{name}_bucket{_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{value}"' for key, value in labels)
+    return f"{{{pairs}}}"
+
+
+cache_metrics = CacheMetrics()
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+from typing import Iterable, Optional
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.local_cache import local_cache
+from app.core.redis import RedisClient, get_settings
+
+logger = logging.getLogger(__name__)
+
+TAG_KEY_PREFIX = "cache:tag:"  # Префикс ключей Redis, хранящих множества ключей тега
+TAG_TTL_MARGIN = 60  # Запас (сек.) времени жизни тега относительно записей кэша
+
+RESTAURANTS_TAG = "restaurants"  # Тег списков ресторанов
+TIERS_TAG = "tiers"  # Тег записей с уровнями доступа
+
+
+# ========================
+# Имена тегов
+# ========================
+
+
+def restaurant_tag(restaurant_id: int) -> str:
+    """Тег всех записей кэша, зависящих от ресторана"""
+    return f"restaurant:{restaurant_id}"
+
+
+def product_tag(product_id: int) -> str:
+    """Тег всех записей кэша, зависящих от продукта"""
+    return f"product:{product_id}"
+
+
+def tag_key(tag: str) -> str:
+    """Ключ Redis, в котором хранится множество ключей кэша с данным тегом"""
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
+# ========================
+# Регистрация и удаление
+# ========================
+
+
+async def register_tags(
+    redis: Redis, key: str, tags: Iterable[str], expire: int
+) -> None:
+    """
+    Регистрирует ключ кэша в множествах тегов.
+
+    Время жизни множества только продлевается (EXPIRE NX + EXPIRE GT), поэтому
+    тег живет не меньше самой долгой записи, которая в нем зарегистрирована.
+    """
+    pipe = redis.pipeline(transaction=False)
+    queue_tags(pipe, key, tags, expire)
+    await pipe.execute()
+
+
+def queue_tags(pipe: Pipeline, key: str, tags: Iterable[str], expire: int) -> None:
+    """Добавить в пайплайн команды регистрации ключа в тегах (см. register_tags)"""
+    for tag in set(tags):
+        pipe.sadd(tag_key(tag), key)
+        pipe.expire(tag_key(tag), expire + TAG_TTL_MARGIN, nx=True)
+        pipe.expire(tag_key(tag), expire + TAG_TTL_MARGIN, gt=True)
+
+
+async def unlink_keys(redis: Redis, keys: list) -> int:
+    """
+    Удалить ключи через UNLINK пачками по `settings.cache.invalidation_batch_size`
+    за один сетевой проход (pipeline). Возвращает количество удаленных ключей.
+    """
+    if not keys:
+        return 0
+    batch_size = settings.cache.invalidation_batch_size
+    pipe = redis.pipeline(transaction=False)
+    for start in range(0, len(keys), batch_size):
+        pipe.unlink(*keys[start : start + batch_size])
+    return sum(await pipe.execute())
+
+
+async def purge_tags(redis: Redis, tags: Iterable[str]) -> int:
+    """
+    Удаляет все ключи кэша, зарегистрированные в переданных тегах.
+
+    Чтение и очистка множества тега выполняются атомарно (MULTI/EXEC), затем
+    ключи удаляются пачками через UNLINK одним пайплайном. Возвращает количество
+    удаленных ключей.
+    """
+    tags = list(set(tags))
+    if not tags:
+        return 0
+
+    pipe = redis.pipeline(transaction=True)
+    for tag in tags:
+        pipe.smembers(tag_key(tag))
+        pipe.delete(tag_key(tag))
+    results = await pipe.execute()
+
+    keys = set()
+    for members in results[::2]:
+        keys.update(members)
+    keys = list(keys)
+    # Сбрасываем L1-кэш текущего воркера, остальные воркеры догонят через его TTL
+    local_cache.delete(
+        *(key.decode() if isinstance(key, bytes) else key for key in keys)
+    )
+    return await unlink_keys(redis, keys)
+
+
+class CacheTagInvalidator:
+    """
+    Отложенная (debounced) инвалидация кэша по тегам.
+
+    Теги, накопленные за окно `settings.cache.invalidation_debounce`, удаляются
+    одним проходом, поэтому массовое редактирование в админке не порождает
+    тысячи отдельных DELETE.
+    """
+
+    _pending: set[str] = set()  # Теги, ожидающие удаления
+    _task: Optional[asyncio.Task] = None  # Задача отложенного удаления
+
+    @classmethod
+    def schedule(cls, *tags: str) -> None:
+        """Поставить теги в очередь на инвалидацию"""
+        cls._pending.update(tag for tag in tags if tag)
+        if not cls._pending:
+            return
+        if cls._task is None or cls._task.done():
+            cls._task = asyncio.get_running_loop().create_task(cls._flush_later())
+
+    @classmethod
+    async def _flush_later(cls) -> None:
+        await asyncio.sleep(settings.cache.invalidation_debounce)
+        await cls.flush()
+
+    @classmethod
+    async def flush(cls) -> int:
+        """Немедленно удалить ключи всех накопленных тегов"""
+        if not cls._pending:
+            return 0
+        tags, cls._pending = cls._pending, set()
+        try:
+            redis = await RedisClient.get_client(get_settings())
+            deleted = await purge_tags(redis, tags)
+            logger.info(f"Инвалидация кэша: теги={len(tags)}, ключи={deleted}")
+            return deleted
+        except RedisError as e:
+            logger.error(f"Ошибка при инвалидации кэша по тегам {tags}: {e}")
+            return 0
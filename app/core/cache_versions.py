@@ -0,0 +1,146 @@
+import logging
+import time
+from typing import Iterable, Optional, Sequence
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.models.db_helper import db_helper
+from app.core.models.product_model import Product
+from app.core.models.restaurant_model import Restaurant
+from app.core.redis import RedisClient, get_settings
+
+logger = logging.getLogger(__name__)
+
+# ========================
+# Версии содержимого ресторанов
+# ========================
+#
+# Версия меняется при любом изменении ресторана, его продуктов, порций или
+# категорий. Начальное значение - текущее время в наносекундах, поэтому после
+# потери ключа (очистка Redis, истечение TTL) версия не повторяет старые значения.
+
+
+def restaurant_version_key(restaurant_uuid: UUID | str) -> str:
+    """Ключ Redis с версией содержимого ресторана"""
+    return f"cache:version:restaurant:{restaurant_uuid}"
+
+
+async def get_restaurant_version(
+    redis: Redis, restaurant_uuid: UUID | str, create: bool = False
+) -> Optional[int]:
+    """
+    Текущая версия содержимого ресторана.
+
+    /create: Создать версию, если ее нет. Без флага для неизвестного ресторана
+    возвращается None, чтобы случайные UUID не порождали ключей в Redis.
+    """
+    key = restaurant_version_key(restaurant_uuid)
+    if create:
+        pipe = redis.pipeline(transaction=False)
+        pipe.set(key, time.time_ns(), nx=True, ex=settings.cache.version_ttl)
+        pipe.get(key)
+        _, version = await pipe.execute()
+    else:
+        version = await redis.get(key)
+    return int(version) if version is not None else None
+
+
+async def drop_restaurant_version(redis: Redis, restaurant_uuid: UUID | str) -> None:
+    """Удалить версию ресторана, отсутствие которого подтвердила БД"""
+    try:
+        await redis.delete(restaurant_version_key(restaurant_uuid))
+    except RedisError as e:
+        logger.error(f"Ошибка при удалении версии ресторана {restaurant_uuid}: {e}")
+
+
+async def get_restaurant_versions(
+    redis: Redis, restaurant_uuids: Sequence[UUID]
+) -> dict[UUID, Optional[int]]:
+    """Текущие версии нескольких ресторанов одним MGET (без создания)"""
+    if not restaurant_uuids:
+        return {}
+    versions = await redis.mget(
+        [restaurant_version_key(uuid) for uuid in restaurant_uuids]
+    )
+    return {
+        restaurant_uuid: int(version) if version is not None else None
+        for restaurant_uuid, version in zip(restaurant_uuids, versions)
+    }
+
+
+def affected_restaurants(
+    restaurant_ids: Iterable[int] = (),
+    product_ids: Iterable[int] = (),
+    category_ids: Iterable[int] = (),
+):
+    """
+    Условие на рестораны, затронутые изменением: по ID ресторанов, их продуктов
+    или категорий продуктов. None - затронутых ресторанов нет.
+    """
+    restaurant_ids, product_ids, category_ids = (
+        list(restaurant_ids),
+        list(product_ids),
+        list(category_ids),
+    )
+    conditions = []
+    if restaurant_ids:
+        conditions.append(Restaurant.id.in_(restaurant_ids))
+    if product_ids:
+        conditions.append(
+            Restaurant.id.in_(
+                select(Product.restaurant_id).where(Product.id.in_(product_ids))
+            )
+        )
+    if category_ids:
+        conditions.append(
+            Restaurant.id.in_(
+                select(Product.restaurant_id).where(
+                    Product.category_id.in_(category_ids)
+                )
+            )
+        )
+    return or_(*conditions) if conditions else None
+
+
+async def bump_restaurant_versions(
+    db: Optional[AsyncSession] = None,
+    restaurant_uuids: Iterable[UUID] = (),
+    restaurant_ids: Iterable[int] = (),
+    product_ids: Iterable[int] = (),
+    category_ids: Iterable[int] = (),
+) -> None:
+    """
+    Увеличить версии всех ресторанов, затронутых изменением.
+
+    Рестораны задаются напрямую (UUID), по ID или через продукты и категории.
+    Без переданной сессии БД открывает собственную (например, в хуках админки).
+    """
+    uuids = set(restaurant_uuids)
+    condition = affected_restaurants(restaurant_ids, product_ids, category_ids)
+    if condition is not None:
+        query = select(Restaurant.uuid).where(condition)
+        if db is None:
+            async with db_helper.session_factory() as session:
+                uuids.update((await session.execute(query)).scalars().all())
+        else:
+            uuids.update((await db.execute(query)).scalars().all())
+    if not uuids:
+        return
+
+    try:
+        redis = await RedisClient.get_client(get_settings())
+        pipe = redis.pipeline(transaction=True)
+        for restaurant_uuid in uuids:
+            key = restaurant_version_key(restaurant_uuid)
+            # Потерянный ключ засевается временем, иначе INCR начал бы с 1
+            pipe.set(key, time.time_ns(), nx=True, ex=settings.cache.version_ttl)
+            pipe.incr(key)
+            pipe.expire(key, settings.cache.version_ttl)
+        await pipe.execute()
+    except RedisError as e:
+        logger.error(f"Ошибка при обновлении версий ресторанов {uuids}: {e}")
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from app.core.cache_metrics import cache_metrics
+
+logger = logging.getLogger(__name__)
+
+# Состояния автомата (значение показателя circuit_state)
+CLOSED = 0  # Вызовы проходят
+OPEN = 1  # Вызовы отклоняются сразу, идет фоновая проверка
+
+# Отказы доступности. Ошибки команд (ResponseError и т.п.) автомат не открывают
+FAILURE_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError, TimeoutError)
+
+
+class CircuitOpenError(RedisConnectionError):
+    """
+    Вызов отклонен без обращения к Redis: автомат открыт. Наследует ошибку
+    соединения Redis, поэтому обрабатывается там же, где и обычный отказ.
+    """
+
+
+class CircuitBreaker:
+    """
+    Автоматический выключатель (circuit breaker) для внешней зависимости.
+
+    После `failure_threshold` отказов подряд автомат открывается: вызовы
+    отклоняются сразу на время `reset_timeout`, после чего фоновая задача
+    проверяет зависимость `probe` и закрывает автомат при успехе (или ждет
+    следующего окна). Запросы пользователей проверкой не занимаются.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        probe: Callable[[], Awaitable[object]],
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        probe_timeout: float = 1.0,
+    ):
+        self.name = name  # Имя для логов и меток метрик
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = probe_timeout
+        self.state = CLOSED
+        self._failures = 0  # Отказов подряд
+        self._probe_task: Optional[asyncio.Task] = None
+        cache_metrics.set_gauge("circuit_state", CLOSED, breaker=name)
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def before_call(self) -> None:
+        """Проверить автомат перед вызовом. При открытом - CircuitOpenError"""
+        if self.state == OPEN:
+            cache_metrics.inc("circuit_rejected_total", breaker=self.name)
+            raise CircuitOpenError(f"Автомат {self.name} открыт")
+
+    def record_success(self) -> None:
+        self._failures = 0
+
+    def record_failure(self, error: BaseException) -> None:
+        """Учесть отказ; после порога подряд идущих отказов открыть автомат"""
+        if not isinstance(error, FAILURE_ERRORS) or isinstance(error, CircuitOpenError):
+            return
+        self._failures += 1
+        if self.state == CLOSED and self._failures >= self.failure_threshold:
+            self._open(error)
+
+    def _open(self, error: BaseException) -> None:
+        logger.error(
+            f"Автомат {self.name} открыт после {self._failures} отказов подряд, "
+            f"вызовы пропускаются {self.reset_timeout} сек.: {error}"
+        )
+        self.state = OPEN
+        cache_metrics.set_gauge("circuit_state", OPEN, breaker=self.name)
+        cache_metrics.inc("circuit_opened_total", breaker=self.name)
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.create_task(self._probe_until_closed())
+
+    def _close(self) -> None:
+        logger.info(f"Автомат {self.name} закрыт: зависимость снова доступна")
+        self.state = CLOSED
+        self._failures = 0
+        cache_metrics.set_gauge("circuit_state", CLOSED, breaker=self.name)
+
+    async def _probe_until_closed(self) -> None:
+        """Проверять зависимость раз в `reset_timeout`, пока она не ответит"""
+        while self.state == OPEN:
+            await asyncio.sleep(self.reset_timeout)
+            try:
+                await asyncio.wait_for(self.probe(), self.probe_timeout)
+            except Exception as e:
+                cache_metrics.inc(
+                    "circuit_probes_total", breaker=self.name, result="failure"
+                )
+                logger.warning(f"Проверка {self.name} не прошла: {e}")
+                continue
+            cache_metrics.inc(
+                "circuit_probes_total", breaker=self.name, result="success"
+            )
+            self._close()
+
+    async def stop(self) -> None:
+        """Остановить фоновую проверку"""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            await asyncio.gather(self._probe_task, return_exceptions=True)
+            self._probe_task = None
@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import Literal
 
 from dotenv import load_dotenv
 from pydantic import BaseModel, PostgresDsn, Field
@@ -38,6 +39,9 @@ class DatabaseConfig(BaseModel):
     echo_pool: bool = False  # Выводить логирование пула соединений
     pool_size: int = 50  # Размер количества соединений в пуле
     max_overflow: int = 10  # Количество превышения пула соединений
+    pool_timeout: float = 5.0  # Ожидание свободного соединения из пула (сек.)
+    connect_timeout: float = 3.0  # Таймаут установки соединения с БД (сек.)
+    unavailable_backoff: float = 5.0  # Сколько не обращаться к БД после отказа (сек.)
 
     naming_convention: dict[str, str] = {
         "ix": "ix_%(column_0_label)s",
@@ -68,6 +72,9 @@ class RedisConfig(BaseModel):
         True  # Флаг, указывающий, следует ли повторять попытки при таймауте
     )
     health_check_interval: int = 60  # Интервал проверки состояния соединения с Redis
+    breaker_failure_threshold: int = 5  # Отказов подряд до отключения обращений к Redis
+    breaker_reset_timeout: float = 10.0  # Пауза перед проверкой Redis после отключения
+    breaker_probe_timeout: float = 1.0  # Таймаут фоновой проверки (PING) Redis
 
     def get_redis_url(self) -> str:
         """Получить URL для подключения к Redis"""
@@ -75,6 +82,71 @@ class RedisConfig(BaseModel):
         return f"redis://{auth}{self.host}:{self.port}/{self.db}"
 
 
+class CacheConfig(BaseModel):
+    """
+    Конфигурация кэширования
+    """
+
+    invalidation_debounce: float = (
+        0.5  # Время (сек.) группировки инвалидаций тегов перед удалением ключей
+    )
+    invalidation_batch_size: int = 500  # Количество ключей в одной команде UNLINK
+    local_enabled: bool = True  # Включить L1-кэш в памяти воркера перед Redis
+    local_max_bytes: int = 64 * 1024 * 1024  # Бюджет памяти L1-кэша в байтах
+    local_ttl: float = 5.0  # Время жизни записи L1-кэша в секундах
+    lock_ttl: float = 10.0  # Время жизни блокировки заполнения кэша в секундах
+    lock_wait_timeout: float = 3.0  # Максимальное ожидание чужого заполнения кэша
+    menu_ttl: int = 300  # Время "свежести" страницы меню в кэше (мягкий TTL)
+    menu_stale_ttl: int = 600  # Срок отдачи устаревшей страницы с обновлением в фоне
+    codec: str = "orjson"  # Кодек значений кэша: json, orjson или msgpack
+    compression: str | None = None  # Сжатие значений кэша: zstd, lz4 или None
+    compression_threshold: int = 1024  # Сжимать значения от этого размера (байт)
+    version_ttl: int = 7 * 24 * 60 * 60  # Время жизни счетчика версии ресторана
+    etag_salt: str = ""  # Добавка к ETag (например, номер релиза шаблонов)
+    warm_enabled: bool = True  # Прогревать кэш меню при старте и периодически
+    warm_startup_delay: float = 5.0  # Задержка первого прогрева после старта (сек.)
+    warm_interval: int = 300  # Интервал между прогревами (сек.)
+    warm_pages: int = 3  # Сколько первых страниц меню прогревать
+    warm_page_size: int = 1  # Размер страницы при прогреве (как у меню по умолчанию)
+    warm_max_restaurants: int = 100  # Максимум ресторанов за один прогрев
+    warm_concurrency: int = 4  # Одновременных построений страниц при прогреве
+    warm_traffic_decay: float = 0.5  # Множитель старого трафика на каждом цикле
+    warm_traffic_min_score: float = 0.1  # Угасший трафик ниже этого удаляется
+    warm_traffic_max_members: int = 10_000  # Максимум ресторанов в рейтинге трафика
+    negative_ttl: int = 30  # Время жизни записи "не найдено" (сек.)
+    restaurant_filter_enabled: bool = True  # Отсекать неизвестные UUID в памяти
+    restaurant_filter_capacity: int = 100_000  # Минимальная емкость фильтра UUID
+    restaurant_filter_error_rate: float = 0.001  # Доля ложных срабатываний фильтра
+    restaurant_filter_refresh: int = 300  # Интервал полной перестройки фильтра (сек.)
+    prefetch_enabled: bool = True  # Строить следующую страницу меню в фоне
+    prefetch_window: float = 30.0  # Окно "недавнего запроса" варианта меню (сек.)
+    prefetch_rate: float = 20.0  # Максимум фоновых построений в секунду на воркер
+    prefetch_concurrency: int = 2  # Одновременных фоновых построений на воркер
+    menu_fallback_ttl: int = 24 * 60 * 60  # Время жизни резервной копии меню (сек.)
+
+
+class MenuConfig(BaseModel):
+    """
+    Конфигурация страниц меню ресторана
+    """
+
+    default_page_size: int = 1  # Размер страницы меню по умолчанию
+    max_page_size: int = 25  # Максимальный размер страницы меню
+    count_ttl: int = 60 * 60  # Время жизни счетчика продуктов меню (сек.)
+    # Источник страниц меню: orm (объекты ORM), sql (JSON, собранный запросом
+    # к таблицам) или read_model (документ restaurant_menus, нужна миграция)
+    source: Literal["read_model", "orm", "sql"] = "orm"
+
+
+class PaginationConfig(BaseModel):
+    """
+    Конфигурация курсорной пагинации списков
+    """
+
+    default_limit: int = 50  # Размер страницы списка по умолчанию
+    max_limit: int = 200  # Максимальный размер страницы списка
+
+
 class AuthJWT(BaseModel):  # Конфигурация JWT токенов для аутентификации
     # Путь к файлу с закрытым ключом
     private_key_path: Path = BASE_DIR / "certs" / "jwt-private.pem"
@@ -105,6 +177,9 @@ class Settings(BaseSettings):
     db: DatabaseConfig = DatabaseConfig()
     auth: AuthJWT = AuthJWT()  # Конфигурация JWT токенов для аутентификации
     redis: RedisConfig = RedisConfig()  # Конфигурация Redis
+    cache: CacheConfig = CacheConfig()  # Конфигурация кэширования
+    menu: MenuConfig = MenuConfig()  # Конфигурация страниц меню
+    pagination: PaginationConfig = PaginationConfig()  # Пагинация списков
 
 
 settings = Settings()
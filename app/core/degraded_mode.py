@@ -0,0 +1,46 @@
+import math
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import ORJSONResponse
+
+from app.core.config import settings
+from app.core.models.db_helper import DB_UNAVAILABLE_ERRORS, db_helper
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})  # Методы, разрешенные без БД
+
+# ========================
+# Режим только для чтения при недоступной БД
+# ========================
+
+
+def database_unavailable_response() -> ORJSONResponse:
+    """Ответ 503: БД недоступна, повторить после паузы"""
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Сервис временно доступен только для чтения."},
+        headers={"Retry-After": str(math.ceil(settings.db.unavailable_backoff))},
+    )
+
+
+def register_degraded_mode(app: FastAPI) -> None:
+    """
+    Режим только для чтения на время недоступности БД.
+
+    Ошибка соединения с БД или исчерпанный пул отвечают 503 (вместо 500) и
+    открывают паузу `settings.db.unavailable_backoff`: в это время запросы на
+    запись отклоняются сразу, не дожидаясь таймаута пула, а меню читается из
+    резервных копий в Redis.
+    """
+
+    async def handle_database_unavailable(request: Request, exc: Exception):
+        db_helper.mark_unavailable(exc)
+        return database_unavailable_response()
+
+    for error in DB_UNAVAILABLE_ERRORS:
+        app.add_exception_handler(error, handle_database_unavailable)
+
+    @app.middleware("http")
+    async def reject_writes_when_degraded(request: Request, call_next):
+        if request.method not in READ_METHODS and not db_helper.is_available:
+            return database_unavailable_response()
+        return await call_next(request)
@@ -0,0 +1,67 @@
+import uuid as uuid_pkg
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from app.core.models.product_model import MeasurementType
+
+# ========================
+# Объекты чтения (DTO)
+# ========================
+#
+# Легкие неизменяемые записи для публичного чтения: строятся из строк запросов
+# SQLAlchemy Core (app.core.read_queries) без ORM-объектов и identity map.
+# Имена полей совпадают с колонками моделей и полями схем ответа, поэтому
+# схемы pydantic читают их как атрибуты (from_attributes).
+
+
+@dataclass(slots=True, frozen=True)
+class RestaurantRow:
+    """Ресторан в списке (без описания)"""
+
+    id: int
+    uuid: uuid_pkg.UUID
+    name: str
+    slug: str
+    address: str | None
+    is_active: bool
+    image_url: str | None
+    phone: str | None
+    created_at: datetime
+    owner_id: int | None
+
+
+@dataclass(slots=True, frozen=True)
+class PortionRow:
+    """Порция продукта"""
+
+    id: int
+    product_id: int
+    name: str
+    unit_type: MeasurementType
+    size: float
+    price: float
+    is_available: bool
+
+
+@dataclass(slots=True, frozen=True)
+class ProductRow:
+    """Продукт с порциями (порции добавляются отдельным запросом)"""
+
+    id: int
+    name: str
+    description: str | None
+    image_url: str | None
+    restaurant_id: int
+    category_id: int | None
+    created_at: datetime
+    portions: list[PortionRow] = field(default_factory=list)
+
+
+@dataclass(slots=True, frozen=True)
+class CategoryRow:
+    """Категория продуктов"""
+
+    id: int
+    name: str
+    slug: str
+    description: str | None
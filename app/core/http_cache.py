@@ -0,0 +1,130 @@
+import gzip
+import hashlib
+from typing import Iterable
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+# Необязательная зависимость: сжатие brotli
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+IDENTITY = "identity"  # Тело без сжатия
+
+# ========================
+# HTTP-кэширование: ETag и условные запросы
+# ========================
+
+
+def make_etag(*parts: object) -> str:
+    """Сильный ETag из частей, однозначно определяющих содержимое ответа"""
+    raw = ":".join(str(part) for part in (settings.cache.etag_salt, *parts))
+    return f'"{hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Совпадает ли ETag с заголовком If-None-Match запроса"""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    candidates = {candidate.strip() for candidate in header.split(",")}
+    # Для If-None-Match используется слабое сравнение
+    candidates |= {candidate[2:] for candidate in candidates if candidate[:2] == "W/"}
+    return "*" in candidates or etag in candidates
+
+
+def cache_headers(etag: str, vary: Iterable[str] = ("Accept-Encoding",)) -> dict:
+    """Заголовки кэширования: клиент хранит ответ, но перепроверяет его по ETag"""
+    return {
+        "ETag": etag,
+        "Cache-Control": "public, no-cache",
+        "Vary": ", ".join(vary),
+    }
+
+
+def no_store_headers(vary: Iterable[str] = ("Accept-Encoding",)) -> dict:
+    """
+    Заголовки ответа без ETag и без хранения у клиента: версия содержимого
+    неизвестна (Redis недоступен), и повторный запрос должен прийти за данными
+    """
+    return {"Cache-Control": "no-store", "Vary": ", ".join(vary)}
+
+
+def stale_headers(vary: Iterable[str] = ("Accept-Encoding",)) -> dict:
+    """
+    Заголовки ответа из резервной копии при недоступной БД: без ETag и без
+    хранения у клиента, чтобы после восстановления он получил актуальные данные
+    """
+    return {
+        **no_store_headers(vary),
+        "Warning": '110 - "Response is Stale"',
+        "X-Served-Stale": "1",
+    }
+
+
+def not_modified(etag: str, vary: Iterable[str] = ("Accept-Encoding",)) -> Response:
+    """Ответ 304 Not Modified"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag, vary)
+    )
+
+
+# ========================
+# Готовые тела ответов: несжатое и сжатые варианты
+# ========================
+
+
+def accepted_encoding(request: Request) -> str:
+    """
+    Лучшее сжатие, которое принимает клиент: br, gzip или identity.
+    Явно указанное сжатие (в том числе отклоненное через q=0) важнее `*`.
+    """
+    qualities = {}
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        name, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    def accepts(coding: str) -> bool:
+        return qualities.get(coding, qualities.get("*", 0.0)) > 0
+
+    if brotli is not None and accepts("br"):
+        return "br"
+    if accepts("gzip"):
+        return "gzip"
+    return IDENTITY
+
+
+def compress_body(body: bytes) -> dict[str, bytes]:
+    """
+    Варианты тела ответа по Content-Encoding. Короткие тела (меньше
+    `settings.cache.compression_threshold`) не сжимаются.
+    """
+    variants = {IDENTITY: body}
+    if len(body) >= settings.cache.compression_threshold:
+        variants["gzip"] = gzip.compress(body, compresslevel=6, mtime=0)
+        if brotli is not None:
+            variants["br"] = brotli.compress(body, quality=5)
+    return variants
+
+
+def encoded_response(
+    body: bytes,
+    encoding: str,
+    headers: dict,
+    media_type: str = "application/json",
+) -> Response:
+    """Ответ с готовым (возможно, уже сжатым) телом без повторной сериализации"""
+    if encoding != IDENTITY:
+        headers = {**headers, "Content-Encoding": encoding}
+    return Response(content=body, media_type=media_type, headers=headers)
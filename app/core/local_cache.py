@@ -0,0 +1,79 @@
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.core.config import settings
+
+
+class LocalCache:
+    """
+    LRU-кэш в памяти воркера (L1) перед Redis.
+
+    Размер ограничен бюджетом в байтах: вес записи - это размер ее сериализованного
+    представления в Redis. Каждая запись живет не дольше `ttl` секунд, поэтому
+    изменения, сделанные другими воркерами, становятся видны не позже чем через `ttl`.
+    Значения отдаются без копирования - вызывающий код не должен их изменять.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, enabled: bool = True):
+        self.max_bytes = max_bytes  # Бюджет памяти в байтах
+        self.ttl = ttl  # Время жизни записи в секундах
+        self.enabled = enabled  # Включен ли кэш
+        self._entries: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._size = 0  # Текущий суммарный вес записей
+
+    @property
+    def size(self) -> int:
+        """Текущий занятый объем в байтах"""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        """Получить значение или None, если его нет или оно устарело"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self._pop(key)
+            return None
+        self._entries.move_to_end(key)  # Отмечаем запись как недавно использованную
+        return value
+
+    def set(self, key: str, value: Any, size: int, ttl: Optional[float] = None):
+        """Сохранить значение весом `size` байт, вытесняя самые старые записи"""
+        if not self.enabled:
+            return
+        self._pop(key)
+        if size > self.max_bytes:
+            return  # Запись больше всего бюджета - не кэшируем
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + ttl, size, value)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    def delete(self, *keys: str) -> None:
+        """Удалить записи по ключам"""
+        for key in keys:
+            self._pop(key)
+
+    def clear(self) -> None:
+        """Очистить кэш"""
+        self._entries.clear()
+        self._size = 0
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+
+local_cache = LocalCache(
+    max_bytes=settings.cache.local_max_bytes,  # Бюджет памяти L1-кэша
+    ttl=settings.cache.local_ttl,  # Время жизни записи L1-кэша
+    enabled=settings.cache.local_enabled,  # Включен ли L1-кэш
+)
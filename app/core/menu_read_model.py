@@ -0,0 +1,244 @@
+import logging
+from bisect import bisect_right
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import Text, cast, func, or_, select
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache_versions import affected_restaurants
+from app.core.config import settings
+from app.core.models.category_model import Category
+from app.core.models.db_helper import db_helper
+from app.core.models.product_model import Product
+from app.core.models.product_size_model import Portion
+from app.core.models.restaurant_menu_model import RestaurantMenu
+from app.core.models.restaurant_model import Restaurant
+from app.core.pagination import menu_pagination
+from app.core.sql_json import json_array, json_object
+
+logger = logging.getLogger(__name__)
+
+# ========================
+# Модель чтения меню ресторанов
+# ========================
+#
+# Документ restaurant_menus.document:
+#   restaurant - строка ресторана, categories - категории по названию,
+#   products - продукты с порциями по ID,
+#   category_products - {slug категории: ID ее продуктов по возрастанию}.
+# Страница меню вырезается из документа, прочитанного по первичному ключу.
+
+
+def menu_document():
+    """SQL-выражение документа меню для строки restaurants внешнего запроса"""
+    restaurant_categories = select(Product.category_id).where(
+        Product.restaurant_id == Restaurant.id
+    )
+    categories = (
+        select(
+            json_array(
+                json_object(id=Category.id, name=Category.name, slug=Category.slug),
+                Category.name,
+            )
+        )
+        .where(Category.id.in_(restaurant_categories))
+        .scalar_subquery()
+    )
+
+    # Enum хранится именем (GRAMS), в документе - значение (grams)
+    portion = json_object(
+        id=Portion.id,
+        name=Portion.name,
+        unit_type=func.lower(cast(Portion.unit_type, Text)),
+        size=Portion.size,
+        price=Portion.price,
+        is_available=Portion.is_available,
+    )
+    portions = (
+        select(json_array(portion, Portion.id))
+        .where(Portion.product_id == Product.id)
+        .scalar_subquery()
+    )
+    product = json_object(
+        id=Product.id,
+        name=Product.name,
+        description=Product.description,
+        image_url=Product.image_url,
+        category=json_object(id=Product.category_id),
+        portions=portions,
+    )
+    products = (
+        select(json_array(product, Product.id))
+        .where(Product.restaurant_id == Restaurant.id)
+        .scalar_subquery()
+    )
+
+    category_product_ids = (
+        select(json_array(Product.id, Product.id))
+        .where(
+            Product.restaurant_id == Restaurant.id,
+            Product.category_id == Category.id,
+        )
+        .scalar_subquery()
+    )
+    category_products = (
+        select(
+            func.coalesce(
+                func.json_object_agg(Category.slug, category_product_ids),
+                func.json_build_object(),
+            )
+        )
+        .where(Category.id.in_(restaurant_categories))
+        .scalar_subquery()
+    )
+
+    return json_object(
+        restaurant=func.row_to_json(Restaurant.__table__.table_valued()),
+        categories=categories,
+        products=products,
+        category_products=category_products,
+    )
+
+
+def upsert_menus(condition):
+    """INSERT ... ON CONFLICT: собрать документы меню ресторанов по условию"""
+    query = insert(RestaurantMenu).from_select(
+        ["restaurant_uuid", "restaurant_id", "document", "updated_at"],
+        select(
+            Restaurant.uuid,
+            Restaurant.id,
+            cast(menu_document(), JSONB),
+            func.now(),
+        ).where(condition),
+    )
+    return query.on_conflict_do_update(
+        index_elements=[RestaurantMenu.restaurant_uuid],
+        set_={
+            "restaurant_id": query.excluded.restaurant_id,
+            "document": query.excluded.document,
+            "updated_at": query.excluded.updated_at,
+        },
+    )
+
+
+async def rebuild_restaurant_menus(
+    db: Optional[AsyncSession] = None,
+    restaurant_uuids: Iterable[UUID] = (),
+    restaurant_ids: Iterable[int] = (),
+    product_ids: Iterable[int] = (),
+    category_ids: Iterable[int] = (),
+) -> None:
+    """
+    Пересобрать документы меню ресторанов, затронутых изменением.
+
+    Вызывается до commit в транзакции изменения: документ фиксируется вместе
+    с данными. Строки затронутых ресторанов блокируются (FOR UPDATE) перед
+    сборкой, поэтому параллельные изменения одного ресторана пересобирают
+    документ по очереди и не затирают друг друга. Удаленный ресторан удаляет
+    свой документ каскадом.
+
+    Без переданной сессии БД открывает собственную и фиксирует ее (хуки админки).
+    Пока меню читается не из модели чтения (`settings.menu.source`), документы
+    не ведутся и таблица restaurant_menus может отсутствовать.
+    """
+    if settings.menu.source != "read_model":
+        return
+
+    conditions = []
+    restaurant_uuids = list(restaurant_uuids)
+    if restaurant_uuids:
+        conditions.append(Restaurant.uuid.in_(restaurant_uuids))
+    condition = affected_restaurants(restaurant_ids, product_ids, category_ids)
+    if condition is not None:
+        conditions.append(condition)
+    if not conditions:
+        return
+
+    async def rebuild(session: AsyncSession) -> None:
+        await session.flush()  # Сборка должна видеть изменения этой транзакции
+        result = await session.execute(
+            select(Restaurant.id)
+            .where(or_(*conditions))
+            .order_by(Restaurant.id)
+            .with_for_update()
+        )
+        locked_ids = result.scalars().all()
+        if locked_ids:
+            await session.execute(upsert_menus(Restaurant.id.in_(locked_ids)))
+
+    if db is None:
+        async with db_helper.session_factory() as session:
+            await rebuild(session)
+            await session.commit()
+    else:
+        await rebuild(db)
+
+
+async def get_menu_document(db: AsyncSession, restaurant_uuid: UUID) -> Optional[dict]:
+    """
+    Документ меню ресторана по первичному ключу. None - ресторан не найден.
+
+    Ресторан без документа (созданный до появления модели чтения) собирается
+    при первом чтении.
+    """
+    document = (
+        await db.execute(
+            select(RestaurantMenu.document).where(
+                RestaurantMenu.restaurant_uuid == restaurant_uuid
+            )
+        )
+    ).scalar_one_or_none()
+    if document is None:
+        result = await db.execute(
+            upsert_menus(Restaurant.uuid == restaurant_uuid).returning(
+                RestaurantMenu.document
+            )
+        )
+        document = result.scalar_one_or_none()
+        await db.commit()
+        if document is not None:
+            logger.info(f"Собран документ меню ресторана {restaurant_uuid}")
+    return document
+
+
+def menu_page(
+    document: dict,
+    page: int,
+    page_size: int,
+    category_filter: Optional[str] = None,
+    after: Optional[int] = None,
+) -> dict:
+    """
+    Страница меню из документа в формате RestaurantCRUD.get_restaurant_menu:
+    по номеру страницы или, если передан `after`, после продукта с этим ID.
+    """
+    products = document["products"]
+    if category_filter:
+        # Неизвестная категория или категория без продуктов ресторана - пусто
+        product_ids = document["category_products"].get(category_filter, ())
+        products_by_id = {product["id"]: product for product in products}
+        products = [products_by_id[product_id] for product_id in product_ids]
+
+    if after is not None:
+        start = bisect_right(products, after, key=lambda product: product["id"])
+    else:
+        start = (page - 1) * page_size
+    page_products = products[start : start + page_size + 1]
+    has_more = len(page_products) > page_size
+    page_products = page_products[:page_size]
+
+    return {
+        "restaurant": document["restaurant"],
+        "categories": document["categories"],
+        "products": page_products,
+        "pagination": menu_pagination(
+            page,
+            page_size,
+            len(products),
+            category_filter,
+            after,
+            page_products[-1]["id"] if has_more else None,
+        ),
+    }
@@ -11,6 +11,7 @@ from app.core.models.category_model import Category
 from app.core.models.restaurant_model import Restaurant
 from app.core.models.product_model import Product, dish_category
 from app.core.models.product_size_model import Portion
+from app.core.models.restaurant_menu_model import RestaurantMenu
 
 
 # Определяем что экспортируем
@@ -26,4 +27,5 @@ __all__ = (
     "Product",
     "dish_category",
     "Portion",
+    "RestaurantMenu",
 )
@@ -1,5 +1,9 @@
+import logging
+import time
 from typing import AsyncGenerator
 
+import asyncpg
+from sqlalchemy import exc, make_url
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncEngine,
@@ -9,6 +13,21 @@ from sqlalchemy.ext.asyncio import (
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+class DatabaseUnavailable(Exception):
+    """БД недоступна: недавний отказ соединения или исчерпан пул"""
+
+
+# Ошибки, означающие недоступность БД, а не ошибку конкретного запроса
+DB_UNAVAILABLE_ERRORS = (
+    DatabaseUnavailable,
+    exc.OperationalError,  # Соединение разорвано или не установлено
+    exc.InterfaceError,
+    exc.TimeoutError,  # Не дождались соединения из пула
+)
+
 
 class DatabaseHelper:
     """
@@ -22,14 +41,33 @@ class DatabaseHelper:
         echo_pool: bool = False,  # Выводить логирование пула соединений
         pool_size: int = 5,  # Размер количества соединений в пуле
         max_overflow: int = 10,  # Количество превышения пула соединений
+        pool_timeout: float = 30.0,  # Ожидание свободного соединения из пула
+        connect_timeout: float = 60.0,  # Таймаут установки соединения
+        unavailable_backoff: float = 5.0,  # Пауза в обращениях к БД после отказа
     ):
+        connect_dsn = make_url(url).set(drivername="postgresql")
+
+        async def connect() -> asyncpg.Connection:
+            """Новое соединение пула: сетевой отказ asyncpg - недоступность БД"""
+            try:
+                return await asyncpg.connect(
+                    connect_dsn.render_as_string(hide_password=False),
+                    timeout=connect_timeout,
+                )
+            except OSError as e:  # Отказ в соединении, таймаут подключения
+                raise DatabaseUnavailable(f"Не удалось подключиться к БД: {e}") from e
+
         self.engine: AsyncEngine = create_async_engine(
             url=url,
             echo=echo,
             echo_pool=echo_pool,
             pool_size=pool_size,
             max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            async_creator=connect,
         )
+        self.unavailable_backoff = unavailable_backoff
+        self._unavailable_until = 0.0  # До какого момента считаем БД недоступной
 
         self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
             bind=self.engine,  # Привязка к создаваемым сессиям к базе данных
@@ -38,6 +76,25 @@ class DatabaseHelper:
             expire_on_commit=False,  # Сами следим за изменениями в БД
         )  # Создание фабрики сессий для асинхронной работы с БД
 
+    @property
+    def is_available(self) -> bool:
+        """False в течение `unavailable_backoff` секунд после отказа БД"""
+        return time.monotonic() >= self._unavailable_until
+
+    def mark_unavailable(self, error: BaseException) -> None:
+        """
+        Отметить отказ БД: на время паузы чтение меню идет из резервных копий
+        в Redis, а запросы на запись отклоняются сразу.
+        """
+        if self.is_available:
+            logger.error(f"База данных недоступна, режим только для чтения: {error}")
+        self._unavailable_until = time.monotonic() + self.unavailable_backoff
+
+    def ensure_available(self) -> None:
+        """Не обращаться к БД во время паузы после отказа"""
+        if not self.is_available:
+            raise DatabaseUnavailable("База данных временно недоступна")
+
     async def dispose(self) -> None:  # Закрытие соединения с базой данных
         await self.engine.dispose()  # Закрытие подключения к БД
 
@@ -54,4 +111,7 @@ db_helper = DatabaseHelper(
     echo_pool=settings.db.echo_pool,  # Выводить логирование пула соединений
     pool_size=settings.db.pool_size,  # Размер количества соединений в пуле
     max_overflow=settings.db.max_overflow,  # Количество превышения пула соединений
+    pool_timeout=settings.db.pool_timeout,  # Ожидание свободного соединения из пула
+    connect_timeout=settings.db.connect_timeout,  # Таймаут установки соединения
+    unavailable_backoff=settings.db.unavailable_backoff,  # Пауза после отказа БД
 )
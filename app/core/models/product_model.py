@@ -10,6 +10,7 @@ from sqlalchemy import (
     DateTime,
     Table,
     Column,
+    Index,
     Integer,
 )
 from enum import Enum as PyEnum
@@ -48,6 +49,16 @@ class Product(BaseModel, IdIntPrimaryKeyMixin):
     """Модель продукта"""
 
     __tablename__ = "products"
+    __table_args__ = (
+        # Keyset-пагинация меню: продукты ресторана (и категории) по возрастанию id
+        Index("ix_products_restaurant_id_id", "restaurant_id", "id"),
+        Index(
+            "ix_products_restaurant_id_category_id_id",
+            "restaurant_id",
+            "category_id",
+            "id",
+        ),
+    )
     # Основные поля
     uuid: Mapped[uuid_pkg.UUID] = mapped_column(
         default=uuid_pkg.uuid4, primary_key=True, unique=True
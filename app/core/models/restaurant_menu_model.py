@@ -0,0 +1,36 @@
+import uuid as uuid_pkg
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.models.base_model import BaseModel
+
+
+class RestaurantMenu(BaseModel):
+    """
+    Модель чтения меню ресторана: один JSONB-документ на ресторан.
+
+    Документ пересобирается в той же транзакции, что и изменение ресторана,
+    его продуктов, порций или категорий; страница меню читается по первичному
+    ключу без соединения таблиц.
+    """
+
+    # Основные поля
+    restaurant_uuid: Mapped[uuid_pkg.UUID] = mapped_column(
+        primary_key=True
+    )  # UUID ресторана (ключ чтения меню)
+    restaurant_id: Mapped[int] = mapped_column(
+        ForeignKey("restaurants.id", ondelete="CASCADE"), unique=True
+    )  # ID ресторана (документ удаляется вместе с рестораном)
+    document: Mapped[dict] = mapped_column(
+        JSONB
+    )  # Ресторан, категории, продукты с порциями и порядок продуктов категорий
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )  # Дата последней сборки
+
+    def __str__(self):
+        return f'Ресторан: "{self.restaurant_uuid}" | Собрано: "{self.updated_at}"'
@@ -4,8 +4,19 @@ from typing import List, TYPE_CHECKING
 from app.utils.slug_generate import slugify
 from app.core.models.base_model import BaseModel
 from app.core.mixins.id_int_pk import IdIntPrimaryKeyMixin
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Text, ForeignKey, DateTime
+from sqlalchemy.orm import Mapped, aliased, mapped_column, relationship
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    case,
+    cast,
+    func,
+    literal,
+    select,
+)
 
 if TYPE_CHECKING:
     from app.core.models.product_model import Product
@@ -45,7 +56,8 @@ class Restaurant(BaseModel, IdIntPrimaryKeyMixin):
         ForeignKey("users.id"),
         nullable=True,
         default=None,
-    )  # Связь с владельцем
+        index=True,
+    )  # Связь с владельцем (с индексом для фильтра списка ресторанов)
 
     # Отношения
     products: Mapped[List["Product"]] = relationship(
@@ -55,7 +67,7 @@ class Restaurant(BaseModel, IdIntPrimaryKeyMixin):
 
     def __init__(self, **data):
         super().__init__(**data)
-        self.slug = self.generate_slug()
+        self.slug = self.unique_slug(self.generate_slug())
 
     def __str__(self):
         return f'ID: "{self.id}" | Название: "{self.name}" | Адрес: "{self.address}"'
@@ -63,3 +75,23 @@ class Restaurant(BaseModel, IdIntPrimaryKeyMixin):
     def generate_slug(self):
         """Генерирует slug на основе названия ресторана"""
         return slugify(self.name)
+
+    @classmethod
+    def unique_slug(cls, base: str):
+        """
+        SQL-выражение уникального slug, вычисляемое в самом INSERT/UPDATE:
+        `base`, если он свободен, иначе `base-N` со следующим свободным номером.
+        Коллизия разрешается за один запрос без повторов после ошибки уникальности.
+        """
+        other = aliased(cls)
+        taken = select(other.id).where(other.slug == base).exists()
+        suffix = cast(func.substring(other.slug, r"-(\d+)$"), Integer)
+        next_number = (
+            select(func.coalesce(func.max(suffix), 1) + 1)
+            .where(other.slug.op("~")(f"^{base}-[0-9]+$"))
+            .scalar_subquery()
+        )
+        return case(
+            (~taken, literal(base)),
+            else_=literal(base) + "-" + cast(next_number, String),
+        )
@@ -0,0 +1,58 @@
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.local_cache import local_cache
+from app.core.redis import RedisClient, get_settings
+from app.core.redis_utils import cache_delete_many, cache_get, cache_set
+
+logger = logging.getLogger(__name__)
+
+# ========================
+# Негативный кэш: записи "не найдено"
+# ========================
+#
+# Короткоживущая отметка об отсутствии сущности избавляет повторные запросы
+# несуществующих ID от обращения к БД. Отметка снимается при создании сущности,
+# в L1 других воркеров она может прожить еще не дольше `settings.cache.local_ttl`.
+
+RESTAURANT = "restaurant"  # Ресторан по UUID
+PRODUCT = "product"  # Продукт по ID
+PORTIONS = "portions"  # Порции продукта по ID продукта
+RESTAURANT_SLUG = "restaurant_slug"  # Ресторан по slug
+
+
+def missing_key(entity: str, identifier: object) -> str:
+    """Ключ отметки об отсутствии сущности"""
+    return f"{entity}:missing:{identifier}"
+
+
+async def is_missing(redis: Redis, entity: str, identifier: object) -> bool:
+    """Известно ли, что сущность не существует"""
+    return await cache_get(redis, missing_key(entity, identifier)) is not None
+
+
+async def mark_missing(redis: Redis, entity: str, identifier: object) -> None:
+    """Запомнить, что сущность не существует"""
+    await cache_set(
+        redis=redis,
+        key=missing_key(entity, identifier),
+        value=1,
+        expire=settings.cache.negative_ttl,
+    )
+
+
+async def clear_missing(entity: str, *identifiers: object) -> None:
+    """Снять отметки об отсутствии (вызывается при создании сущности)"""
+    keys = [missing_key(entity, identifier) for identifier in identifiers]
+    if not keys:
+        return
+    try:
+        redis = await RedisClient.get_client(get_settings())
+    except RedisError as e:
+        local_cache.delete(*keys)
+        logger.error(f"Ошибка при снятии отметок отсутствия {keys}: {e}")
+        return
+    await cache_delete_many(redis, keys)
@@ -0,0 +1,154 @@
+import base64
+import binascii
+import math
+from bisect import bisect_right
+from typing import Annotated, Any, Callable, Optional, Sequence
+
+import orjson
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.config import settings
+
+# ========================
+# Курсоры keyset-пагинации
+# ========================
+#
+# Курсор - непрозрачная для клиента строка: значения ключа сортировки последней
+# отданной записи (и параметры выборки, к которым он привязан) в JSON, base64url.
+
+
+def encode_cursor(*values: object) -> str:
+    """Непрозрачный курсор из значений"""
+    raw = orjson.dumps(values)
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Значения курсора. Некорректный курсор или курсор другой длины - 400.
+
+    /size: Ожидаемое количество значений.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = orjson.loads(raw)
+    except (binascii.Error, ValueError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный курсор.",
+        )
+    return values
+
+
+def cursor_position(cursor: Optional[str], *scope: object) -> Any:
+    """
+    Позиция (значение ключа сортировки) из курсора или None для первой страницы.
+
+    Ключ сортировки - целочисленный (ID). Курсор привязан к параметрам выборки
+    `scope` (фильтрам): курсор, выданный для других фильтров, отклоняется с 400.
+    """
+    if cursor is None:
+        return None
+    position, *cursor_scope = decode_cursor(cursor, 1 + len(scope))
+    if type(position) is not int or cursor_scope != list(scope):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Курсор выдан для других параметров выборки.",
+        )
+    return position
+
+
+def menu_pagination(
+    page: int,
+    page_size: int,
+    total_products: int,
+    category_filter: Optional[str],
+    after: Optional[int],
+    last_id: Optional[int],
+) -> dict:
+    """
+    Блок пагинации страницы меню.
+
+    /after: Позиция курсора (keyset): номер страницы в ответе тогда не указывается.
+    /last_id: ID последнего продукта страницы, если есть следующая страница.
+    """
+    return {
+        "page": page if after is None else None,
+        "page_size": page_size,
+        "total_products": total_products,
+        "total_pages": math.ceil(total_products / page_size),
+        "current_category": category_filter,
+        "next_cursor": (
+            encode_cursor(last_id, category_filter) if last_id is not None else None
+        ),
+    }
+
+
+# ========================
+# Страницы списков
+# ========================
+
+
+# Параметры роутов списков: `cursor: Cursor = None, limit: Limit = DEFAULT_LIMIT`
+Cursor = Annotated[Optional[str], Query(description="Курсор следующей страницы")]
+Limit = Annotated[
+    int,
+    Query(ge=1, le=settings.pagination.max_limit, description="Размер страницы"),
+]
+DEFAULT_LIMIT = settings.pagination.default_limit
+
+
+def page_of(
+    rows: Sequence, limit: int, key: Callable[[Any], Any], scope: tuple = ()
+) -> dict:
+    """
+    Страница (схема CursorPage) из выборки на `limit + 1` элементов: лишний
+    элемент означает, что следующая страница есть.
+    """
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(key(items[-1]), *scope)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+async def keyset_page(
+    db: AsyncSession,
+    query: Select,
+    column: InstrumentedAttribute,
+    cursor: Optional[str],
+    limit: int,
+    scope: tuple = (),
+    factory: Optional[Callable[..., Any]] = None,
+) -> dict:
+    """
+    Страница запроса по возрастанию уникальной индексированной колонки
+    (WHERE column > позиция ORDER BY column LIMIT n + 1) - без OFFSET и count(*).
+
+    /scope: Значения фильтров запроса, к которым привязывается курсор.
+    /factory: Конструктор элемента из колонок строки (запрос колонок, а не модели).
+    """
+    after = cursor_position(cursor, *scope)
+    if after is not None:
+        query = query.where(column > after)
+    query = query.order_by(column).limit(limit + 1)
+    result = await db.execute(query)
+    if factory is None:
+        rows = result.scalars().all()
+    else:
+        rows = [factory(*row) for row in result]
+    return page_of(rows, limit, lambda row: getattr(row, column.key), scope)
+
+
+def sorted_page(
+    items: Sequence, key: Callable[[Any], Any], cursor: Optional[str], limit: int
+) -> dict:
+    """Страница списка в памяти, уже отсортированного по `key` (например, снимка)"""
+    after = cursor_position(cursor)
+    start = 0 if after is None else bisect_right(items, after, key=key)
+    return page_of(items[start : start + limit + 1], limit, key)
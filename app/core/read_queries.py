@@ -0,0 +1,116 @@
+from dataclasses import fields
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dto import CategoryRow, PortionRow, ProductRow, RestaurantRow
+from app.core.models.category_model import Category
+from app.core.models.product_model import Product
+from app.core.models.product_size_model import Portion
+from app.core.models.restaurant_model import Restaurant
+from app.core.pagination import keyset_page
+
+# ========================
+# Запросы чтения без ORM-объектов
+# ========================
+#
+# Выбираются только колонки полей DTO (app.core.dto), строка результата
+# передается в конструктор DTO по позиции. Сессия не создает объектов моделей
+# и не ведет для них identity map, отношения не загружаются.
+
+
+def dto_columns(model: type, dto: type, exclude: Iterable[str] = ()) -> list:
+    """Колонки модели для полей DTO в порядке полей"""
+    exclude = set(exclude)
+    return [getattr(model, f.name) for f in fields(dto) if f.name not in exclude]
+
+
+RESTAURANT_COLUMNS = dto_columns(Restaurant, RestaurantRow)
+PRODUCT_COLUMNS = dto_columns(Product, ProductRow, exclude=("portions",))
+PORTION_COLUMNS = dto_columns(Portion, PortionRow)
+CATEGORY_COLUMNS = dto_columns(Category, CategoryRow)
+
+
+async def read_restaurants(
+    db: AsyncSession,
+    cursor: Optional[str],
+    limit: int,
+    is_active: Optional[bool] = None,
+    owner_id: Optional[int] = None,
+) -> dict:
+    """Страница ресторанов по ID (схема CursorPage) без описаний"""
+    query = select(*RESTAURANT_COLUMNS)
+    if is_active is not None:
+        query = query.where(Restaurant.is_active.is_(is_active))
+    if owner_id is not None:
+        query = query.where(Restaurant.owner_id == owner_id)
+    return await keyset_page(
+        db,
+        query,
+        Restaurant.id,
+        cursor,
+        limit,
+        scope=(is_active, owner_id),
+        factory=RestaurantRow,
+    )
+
+
+async def read_portions(
+    db: AsyncSession, product_ids: Iterable[int]
+) -> dict[int, list[PortionRow]]:
+    """Порции продуктов одним запросом: {ID продукта: порции по ID}"""
+    portions = {product_id: [] for product_id in product_ids}
+    if not portions:
+        return portions
+    result = await db.execute(
+        select(*PORTION_COLUMNS)
+        .where(Portion.product_id.in_(portions))
+        .order_by(Portion.product_id, Portion.id)
+    )
+    for row in result:
+        portions[row.product_id].append(PortionRow(*row))
+    return portions
+
+
+async def read_products(
+    db: AsyncSession,
+    cursor: Optional[str],
+    limit: int,
+    restaurant_id: Optional[int] = None,
+) -> dict:
+    """Страница продуктов ресторана по ID с порциями (схема CursorPage)"""
+    page = await keyset_page(
+        db,
+        select(*PRODUCT_COLUMNS).where(Product.restaurant_id == restaurant_id),
+        Product.id,
+        cursor,
+        limit,
+        scope=(restaurant_id,),
+        factory=ProductRow,
+    )
+    products = page["items"]
+    portions = await read_portions(db, [product.id for product in products])
+    for product in products:
+        product.portions.extend(portions[product.id])
+    return page
+
+
+async def read_product(db: AsyncSession, product_id: int) -> Optional[ProductRow]:
+    """Продукт с порциями по ID"""
+    row = (
+        await db.execute(select(*PRODUCT_COLUMNS).where(Product.id == product_id))
+    ).first()
+    if row is None:
+        return None
+    product = ProductRow(*row)
+    product.portions.extend((await read_portions(db, [product.id]))[product.id])
+    return product
+
+
+async def read_categories(db: AsyncSession, *conditions) -> list[CategoryRow]:
+    """Категории (по условиям), отсортированные по названию"""
+    result = await db.execute(
+        select(*CATEGORY_COLUMNS).where(*conditions).order_by(Category.name)
+    )
+    return [CategoryRow(*row) for row in result]
@@ -5,10 +5,73 @@ from typing import Optional
 from .config import Settings
 import logging
 from redis.asyncio import Redis as AsyncRedis, ConnectionPool as AsyncConnectionPool
+from redis.asyncio.client import Pipeline
+
+from .circuit_breaker import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
 
+class BreakerPipeline(Pipeline):
+    """Пайплайн Redis, выполнение которого проходит через автомат клиента"""
+
+    breaker: CircuitBreaker
+
+    async def execute(self, raise_on_error: bool = True):
+        self.breaker.before_call()
+        try:
+            result = await super().execute(raise_on_error)
+        except Exception as e:
+            self.breaker.record_failure(e)
+            raise
+        self.breaker.record_success()
+        return result
+
+
+class BreakerRedis(AsyncRedis):
+    """
+    Клиент Redis с автоматическим выключателем.
+
+    Пока автомат открыт, команды и пайплайны сразу завершаются CircuitOpenError
+    (подкласс ConnectionError Redis) вместо ожидания таймаутов сокета: кэш
+    обходится, запрос идет в БД. Pub/Sub использует свои соединения и
+    переподключается сам.
+    """
+
+    def __init__(self, *args, breaker_settings: Settings, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.breaker = CircuitBreaker(
+            name="redis",
+            probe=self._probe,
+            failure_threshold=breaker_settings.redis.breaker_failure_threshold,
+            reset_timeout=breaker_settings.redis.breaker_reset_timeout,
+            probe_timeout=breaker_settings.redis.breaker_probe_timeout,
+        )
+
+    async def _probe(self):
+        """PING мимо автомата для фоновой проверки"""
+        return await super().execute_command("PING")
+
+    async def execute_command(self, *args, **options):
+        self.breaker.before_call()
+        try:
+            result = await super().execute_command(*args, **options)
+        except Exception as e:
+            self.breaker.record_failure(e)
+            raise
+        self.breaker.record_success()
+        return result
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: Optional[str] = None
+    ) -> BreakerPipeline:
+        pipe = BreakerPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+        pipe.breaker = self.breaker
+        return pipe
+
+
 class RedisClient:
     """Класс для работы с Redis"""
 
@@ -44,8 +107,10 @@ class RedisClient:
         if cls._instance is None:  # Проверка, создан ли экземпляр клиента
             if cls._pool is None:  # Если пул не инициализирован, инициализируем его
                 await cls.init_pool(settings)
-            cls._instance = AsyncRedis(
-                connection_pool=cls._pool, decode_responses=True
+            # Ответы не декодируются: значения кэша хранятся в бинарном формате.
+            # При серии отказов автомат отключает обращения к Redis на время
+            cls._instance = BreakerRedis(
+                connection_pool=cls._pool, breaker_settings=settings
             )  # Создание клиента Redis
             # Проверка соединения
             try:
@@ -60,6 +125,7 @@ class RedisClient:
     async def close(cls) -> None:
         """Закрыть соединение с Redis"""
         if cls._instance is not None:  # Проверка, существует ли экземпляр клиента
+            await cls._instance.breaker.stop()  # Остановка фоновой проверки Redis
             await cls._instance.close()  # Закрытие соединения с Redis
             cls._instance = None  # Обнуление экземпляра
         if cls._pool is not None:  # Проверка, существует ли пул соединений
@@ -1,8 +1,36 @@
 import json
-from typing import Any
+import logging
+import time
+import uuid
+from datetime import date, datetime
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+import orjson
 from redis.asyncio import Redis
+from redis.exceptions import RedisError
 from sqlalchemy import inspect
 
+from app.core.cache_metrics import cache_metrics, key_family
+from app.core.cache_tags import queue_tags, register_tags, unlink_keys
+from app.core.config import settings
+from app.core.local_cache import local_cache
+
+# Необязательные зависимости: msgpack-кодек и сжатие zstd/lz4
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
 
 def to_dict(instance):
     """
@@ -13,25 +41,399 @@ def to_dict(instance):
     }
 
 
+# ========================
+# Кодеки значений кэша
+# ========================
+#
+# Формат значения в Redis: [версия формата][id кодека][id сжатия][данные].
+# Значения без заголовка (начинаются не с FORMAT_VERSION) - старый формат json,
+# поэтому переключение кодека или сжатия не требует очистки Redis.
+
+FORMAT_VERSION = 1  # Версия формата значения (первый байт)
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+COMPRESSION_LZ4 = 2
+
+MSGPACK_EXT_UUID = 1  # Код расширения msgpack для UUID
+MSGPACK_EXT_DATETIME = 2  # Код расширения msgpack для datetime (ISO 8601)
+MSGPACK_EXT_DATE = 3  # Код расширения msgpack для date (ISO 8601)
+
+
+def _default(obj: Any) -> Any:
+    """Сериализация pydantic-схем. Неизвестные типы - ошибка, а не str(obj)"""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Тип {type(obj).__name__} не поддерживается кэшем")
+
+
+class JsonCodec:
+    """Стандартный json: оставлен для чтения значений старого формата"""
+
+    id = 0
+    name = "json"
+
+    @staticmethod
+    def dumps(value: Any) -> bytes:
+        return json.dumps(value, default=_default).encode()
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """orjson: UUID, datetime, dataclass и Enum сериализуются нативно (в строки)"""
+
+    id = 1
+    name = "orjson"
+
+    @staticmethod
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec:
+    """msgpack: бинарный формат, UUID и datetime восстанавливаются как объекты"""
+
+    id = 2
+    name = "msgpack"
+
+    @staticmethod
+    def _default(obj: Any) -> Any:
+        if isinstance(obj, uuid.UUID):
+            return msgpack.ExtType(MSGPACK_EXT_UUID, obj.bytes)
+        if isinstance(obj, datetime):
+            return msgpack.ExtType(MSGPACK_EXT_DATETIME, obj.isoformat().encode())
+        if isinstance(obj, date):
+            return msgpack.ExtType(MSGPACK_EXT_DATE, obj.isoformat().encode())
+        return _default(obj)
+
+    @staticmethod
+    def _ext_hook(code: int, data: bytes) -> Any:
+        if code == MSGPACK_EXT_UUID:
+            return uuid.UUID(bytes=data)
+        if code == MSGPACK_EXT_DATETIME:
+            return datetime.fromisoformat(data.decode())
+        if code == MSGPACK_EXT_DATE:
+            return date.fromisoformat(data.decode())
+        return msgpack.ExtType(code, data)
+
+    @classmethod
+    def dumps(cls, value: Any) -> bytes:
+        return msgpack.packb(value, default=cls._default, use_bin_type=True)
+
+    @classmethod
+    def loads(cls, data: bytes) -> Any:
+        return msgpack.unpackb(
+            data, ext_hook=cls._ext_hook, raw=False, strict_map_key=False
+        )
+
+
+CODECS = {codec.id: codec for codec in (JsonCodec, OrjsonCodec, MsgpackCodec)}
+CODECS_BY_NAME = {codec.name: codec for codec in CODECS.values()}
+COMPRESSIONS_BY_NAME = {"zstd": COMPRESSION_ZSTD, "lz4": COMPRESSION_LZ4}
+
+
+def _compress(data: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_ZSTD:
+        return zstandard.ZstdCompressor().compress(data)
+    if compression == COMPRESSION_LZ4:
+        return lz4_frame.compress(data)
+    return data
+
+
+def _decompress(data: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_ZSTD:
+        return zstandard.ZstdDecompressor().decompress(data)
+    if compression == COMPRESSION_LZ4:
+        return lz4_frame.decompress(data)
+    return data
+
+
+def _configured_codec():
+    """Кодек и сжатие для записи из настроек с проверкой установленных пакетов"""
+    codec = CODECS_BY_NAME.get(settings.cache.codec)
+    if codec is None:
+        raise ValueError(f"Неизвестный кодек кэша: {settings.cache.codec}")
+    if codec is MsgpackCodec and msgpack is None:
+        raise RuntimeError("Для кодека msgpack установите пакет msgpack")
+
+    compression = COMPRESSION_NONE
+    if settings.cache.compression:
+        compression = COMPRESSIONS_BY_NAME.get(settings.cache.compression)
+        if compression is None:
+            raise ValueError(f"Неизвестное сжатие кэша: {settings.cache.compression}")
+        if compression == COMPRESSION_ZSTD and zstandard is None:
+            raise RuntimeError("Для сжатия zstd установите пакет zstandard")
+        if compression == COMPRESSION_LZ4 and lz4_frame is None:
+            raise RuntimeError("Для сжатия lz4 установите пакет lz4")
+    return codec, compression
+
+
+WRITE_CODEC, WRITE_COMPRESSION = _configured_codec()
+
+
+def encode_value(value: Any) -> bytes:
+    """Сериализовать значение для Redis (с заголовком формата)"""
+    payload = WRITE_CODEC.dumps(value)
+    compression = COMPRESSION_NONE
+    if (
+        WRITE_COMPRESSION != COMPRESSION_NONE
+        and len(payload) >= settings.cache.compression_threshold
+    ):
+        payload = _compress(payload, WRITE_COMPRESSION)
+        compression = WRITE_COMPRESSION
+    return bytes((FORMAT_VERSION, WRITE_CODEC.id, compression)) + payload
+
+
+def decode_value(data: bytes | str) -> Any:
+    """Десериализовать значение из Redis любого поддерживаемого формата"""
+    if isinstance(data, str):
+        data = data.encode()
+    if data[0] != FORMAT_VERSION:
+        return JsonCodec.loads(data)  # Старый формат без заголовка
+    codec = CODECS[data[1]]
+    return codec.loads(_decompress(data[3:], data[2]))
+
+
 # Функция для получения данных в Redis (будет использоваться в других модулях)
-async def cache_get(redis: Redis, key: str) -> Any:
-    data = await redis.get(key)
-    return json.loads(data) if data else None
+async def cache_get(redis: Redis, key: str, use_local: bool = True) -> Any:
+    """
+    Значение из кэша или None. Ошибка Redis считается промахом, но учитывается
+    в метриках отдельно (result="error").
+    """
+    family = key_family(key)
+    # Сначала проверяем L1-кэш в памяти воркера
+    value = local_cache.get(key) if use_local else None
+    if value is not None:
+        cache_metrics.inc("cache_requests_total", family=family, result="l1_hit")
+        return value
+
+    start = time.perf_counter()
+    try:
+        data = await redis.get(key)
+    except RedisError as e:
+        logger.error(f"Ошибка при чтении ключа {key} из Redis: {e}")
+        cache_metrics.inc("cache_requests_total", family=family, result="error")
+        cache_metrics.inc("cache_errors_total", family=family, operation="get")
+        return None
+    finally:
+        cache_metrics.observe(
+            "cache_operation_seconds",
+            time.perf_counter() - start,
+            family=family,
+            operation="get",
+        )
+    if not data:
+        cache_metrics.inc("cache_requests_total", family=family, result="miss")
+        return None
+
+    cache_metrics.inc("cache_requests_total", family=family, result="hit")
+    cache_metrics.inc(
+        "cache_payload_bytes_total", len(data), family=family, operation="read"
+    )
+    with cache_metrics.timer("cache_codec_seconds", family=family, operation="decode"):
+        value = decode_value(data)
+    local_cache.set(key, value, size=len(data))
+    return value
 
 
 # Функция для сохранения данных в Redis (будет использоваться в других модулях)
-async def cache_set(redis: Redis, key: str, value: Any, expire: int = 300):
+async def cache_set(
+    redis: Redis,
+    key: str,
+    value: Any,
+    expire: int = 300,
+    tags: Iterable[str] = (),
+) -> Optional[bool]:
+    """
+    Сохранить значение в кэш. Возвращает None, если значение не сериализуется
+    или Redis недоступен: кэш не должен ломать запрос.
+    """
+    family = key_family(key)
+    try:
+        with cache_metrics.timer(
+            "cache_codec_seconds", family=family, operation="encode"
+        ):
+            data = encode_value(value)
+    except TypeError as e:
+        # Не кэшируем то, что нельзя сериализовать без потерь
+        logger.error(f"Значение для ключа {key} не сериализуется и не кэшируется: {e}")
+        cache_metrics.inc("cache_errors_total", family=family, operation="encode")
+        return None
+
+    start = time.perf_counter()
+    try:
+        await redis.set(key, data, ex=expire)
+        # Регистрируем ключ в тегах, чтобы запись можно было точечно инвалидировать
+        if tags:
+            await register_tags(redis, key, tags, expire)
+    except RedisError as e:
+        logger.error(f"Ошибка при записи ключа {key} в Redis: {e}")
+        cache_metrics.inc("cache_errors_total", family=family, operation="set")
+        return None
+    finally:
+        cache_metrics.observe(
+            "cache_operation_seconds",
+            time.perf_counter() - start,
+            family=family,
+            operation="set",
+        )
+    cache_metrics.inc(
+        "cache_payload_bytes_total", len(data), family=family, operation="write"
+    )
+    # В L1 кладем то же, что вернет cache_get после чтения из Redis
+    local_cache.set(key, decode_value(data), size=len(data), ttl=expire)
+    return True
+
+
+# ========================
+# Пакетные операции: несколько ключей за один сетевой проход
+# ========================
+
+
+async def cache_get_many(
+    redis: Redis, keys: Sequence[str], use_local: bool = True
+) -> list[Any]:
+    """
+    Значения ключей в том же порядке (None - промах) одним MGET. Ключи,
+    найденные в L1-кэше, в Redis не запрашиваются. Ошибка Redis - промах.
+    """
+    values: list[Any] = [None] * len(keys)
+    pending = []  # Индексы ключей, которых нет в L1
+    for index, key in enumerate(keys):
+        value = local_cache.get(key) if use_local else None
+        if value is None:
+            pending.append(index)
+            continue
+        cache_metrics.inc(
+            "cache_requests_total", family=key_family(key), result="l1_hit"
+        )
+        values[index] = value
+    if not pending:
+        return values
+
+    family = key_family(keys[pending[0]])
+    start = time.perf_counter()
+    try:
+        results = await redis.mget([keys[index] for index in pending])
+    except RedisError as e:
+        logger.error(f"Ошибка при чтении {len(pending)} ключей из Redis: {e}")
+        for index in pending:
+            cache_metrics.inc(
+                "cache_requests_total", family=key_family(keys[index]), result="error"
+            )
+        cache_metrics.inc("cache_errors_total", family=family, operation="mget")
+        return values
+    finally:
+        cache_metrics.observe(
+            "cache_operation_seconds",
+            time.perf_counter() - start,
+            family=family,
+            operation="mget",
+        )
+
+    for index, data in zip(pending, results):
+        key = keys[index]
+        family = key_family(key)
+        if not data:
+            cache_metrics.inc("cache_requests_total", family=family, result="miss")
+            continue
+        cache_metrics.inc("cache_requests_total", family=family, result="hit")
+        cache_metrics.inc(
+            "cache_payload_bytes_total", len(data), family=family, operation="read"
+        )
+        with cache_metrics.timer(
+            "cache_codec_seconds", family=family, operation="decode"
+        ):
+            values[index] = decode_value(data)
+        local_cache.set(key, values[index], size=len(data))
+    return values
+
+
+async def cache_set_many(
+    redis: Redis,
+    items: Mapping[str, Any],
+    expire: int | Mapping[str, int] = 300,
+    tags: Optional[Mapping[str, Iterable[str]]] = None,
+) -> int:
+    """
+    Сохранить несколько значений одним пайплайном (SET EX и регистрация тегов).
+
+    /expire: Общее время жизни или время жизни для каждого ключа.
+    /tags: Теги для каждого ключа (ключи без тегов можно не указывать).
+    Возвращает количество сохраненных значений (0, если Redis недоступен).
+    """
+    encoded: dict[str, tuple[bytes, int]] = {}
+    for key, value in items.items():
+        try:
+            with cache_metrics.timer(
+                "cache_codec_seconds", family=key_family(key), operation="encode"
+            ):
+                data = encode_value(value)
+        except TypeError as e:
+            logger.error(
+                f"Значение для ключа {key} не сериализуется и не кэшируется: {e}"
+            )
+            cache_metrics.inc(
+                "cache_errors_total", family=key_family(key), operation="encode"
+            )
+            continue
+        ttl = expire[key] if isinstance(expire, Mapping) else expire
+        encoded[key] = (data, ttl)
+    if not encoded:
+        return 0
+
+    family = key_family(next(iter(encoded)))
+    start = time.perf_counter()
+    try:
+        pipe = redis.pipeline(transaction=False)
+        for key, (data, ttl) in encoded.items():
+            pipe.set(key, data, ex=ttl)
+            if tags and tags.get(key):
+                queue_tags(pipe, key, tags[key], ttl)
+        await pipe.execute()
+    except RedisError as e:
+        logger.error(f"Ошибка при записи {len(encoded)} ключей в Redis: {e}")
+        cache_metrics.inc("cache_errors_total", family=family, operation="mset")
+        return 0
+    finally:
+        cache_metrics.observe(
+            "cache_operation_seconds",
+            time.perf_counter() - start,
+            family=family,
+            operation="mset",
+        )
+    for key, (data, ttl) in encoded.items():
+        cache_metrics.inc(
+            "cache_payload_bytes_total",
+            len(data),
+            family=key_family(key),
+            operation="write",
+        )
+        local_cache.set(key, decode_value(data), size=len(data), ttl=ttl)
+    return len(encoded)
+
+
+async def cache_delete_many(redis: Redis, keys: Iterable[str]) -> int:
+    """
+    Удалить ключи из L1-кэша воркера и из Redis (UNLINK пачками одним пайплайном).
+    Возвращает количество удаленных в Redis ключей (0, если Redis недоступен).
+    """
+    keys = list(keys)
+    if not keys:
+        return 0
+    local_cache.delete(*keys)
     try:
-        await redis.set(
-            key,
-            json.dumps(
-                value, default=lambda x: x.dict() if hasattr(x, "dict") else str(x)
-            ),
-            ex=expire,
-        )
-    except TypeError:
-        # Если есть объекты, которые все еще не могут быть сериализованы,
-        # преобразуйте их в строки
-        await redis.set(
-            key, json.dumps({k: str(v) for k, v in value.items()}), ex=expire
+        return await unlink_keys(redis, keys)
+    except RedisError as e:
+        logger.error(f"Ошибка при удалении {len(keys)} ключей из Redis: {e}")
+        cache_metrics.inc(
+            "cache_errors_total", family=key_family(keys[0]), operation="delete"
         )
+        return 0
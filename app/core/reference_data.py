@@ -0,0 +1,151 @@
+import logging
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache_events import CacheEvents
+from app.core.dto import CategoryRow
+from app.core.models.category_model import Category
+from app.core.models.db_helper import db_helper
+from app.core.models.tier_model import Tier
+from app.core.pagination import keyset_page, sorted_page
+from app.core.read_queries import read_categories
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_DATA_CHANGED = "reference_data_changed"  # Событие изменения справочников
+
+
+class ReferenceData:
+    """
+    Снимок справочников (категории и уровни доступа) в памяти воркера.
+
+    Таблицы маленькие и меняются редко, поэтому загружаются целиком при старте
+    и перезагружаются всеми воркерами по событию в Redis pub/sub после записи
+    (а также при переподключении к каналу событий). Поиск по id, slug и имени -
+    O(1) по словарям. Категории хранятся неизменяемыми записями CategoryRow
+    (без ORM-объектов), уровни доступа - объектами, отсоединенными от сессии,
+    которые только читаются: для записи CRUD загружает строку из БД.
+
+    Если записи нет в снимке (или он еще не загружен), методы обращаются к БД:
+    снимок ускоряет чтение, но не может скрыть только что созданную строку.
+    """
+
+    _loaded: bool = False  # Снимок загружен
+    _categories: list[CategoryRow] = []  # Категории по названию
+    _categories_by_id: dict[int, CategoryRow] = {}
+    _categories_by_slug: dict[str, CategoryRow] = {}
+    _tiers: list[Tier] = []  # Уровни доступа по ID
+    _tiers_by_id: dict[int, Tier] = {}
+    _tiers_by_name: dict[str, Tier] = {}
+
+    # ========================
+    # Загрузка и синхронизация
+    # ========================
+
+    @classmethod
+    async def reload(cls) -> None:
+        """Загрузить справочники из БД и атомарно заменить снимок"""
+        async with db_helper.session_factory() as db:
+            categories = await read_categories(db)
+            tiers = list((await db.execute(select(Tier).order_by(Tier.id))).scalars())
+        cls._categories = categories
+        cls._categories_by_id = {category.id: category for category in categories}
+        cls._categories_by_slug = {category.slug: category for category in categories}
+        cls._tiers = tiers
+        cls._tiers_by_id = {tier.id: tier for tier in tiers}
+        cls._tiers_by_name = {tier.name: tier for tier in tiers}
+        cls._loaded = True
+        logger.info(
+            f"Справочники загружены: категории={len(categories)}, уровни={len(tiers)}"
+        )
+
+    @classmethod
+    async def notify_changed(cls) -> None:
+        """Перезагрузить снимок во всех воркерах (вызывается после записи)"""
+        try:
+            await cls.reload()
+        except Exception as e:
+            logger.error(f"Ошибка при перезагрузке справочников: {e}")
+            cls._loaded = False  # До перезагрузки читаем из БД
+        await CacheEvents.publish(REFERENCE_DATA_CHANGED)
+
+    @classmethod
+    async def start(cls) -> None:
+        """Загрузить снимок при старте и подписаться на события изменения"""
+        try:
+            await cls.reload()
+        except Exception as e:
+            logger.error(f"Справочники не загружены, чтение идет из БД: {e}")
+        CacheEvents.on(REFERENCE_DATA_CHANGED, lambda event: cls.reload())
+        CacheEvents.on_connect(cls.reload)
+
+    # ========================
+    # Категории
+    # ========================
+
+    @classmethod
+    async def get_categories(cls, db: AsyncSession) -> list[CategoryRow]:
+        """Все категории, отсортированные по названию"""
+        if cls._loaded:
+            return list(cls._categories)
+        return await read_categories(db)
+
+    @classmethod
+    async def get_categories_by_ids(
+        cls, db: AsyncSession, category_ids: Iterable[int]
+    ) -> list[CategoryRow]:
+        """Категории по списку ID, отсортированные по названию"""
+        categories, missing = [], []
+        for category_id in set(category_ids):
+            category = cls._categories_by_id.get(category_id) if cls._loaded else None
+            if category is None:
+                missing.append(category_id)
+            else:
+                categories.append(category)
+        if missing:
+            categories.extend(await read_categories(db, Category.id.in_(missing)))
+        return sorted(categories, key=lambda category: category.name)
+
+    @classmethod
+    async def get_category_by_slug(
+        cls, db: AsyncSession, slug: str
+    ) -> Optional[CategoryRow]:
+        """Категория по slug"""
+        category = cls._categories_by_slug.get(slug) if cls._loaded else None
+        if category is None:
+            categories = await read_categories(db, Category.slug == slug)
+            category = categories[0] if categories else None
+        return category
+
+    # ========================
+    # Уровни доступа
+    # ========================
+
+    @classmethod
+    async def get_tiers(
+        cls, db: AsyncSession, cursor: Optional[str], limit: int
+    ) -> dict:
+        """Страница уровней доступа по ID (схема CursorPage)"""
+        if cls._loaded:
+            return sorted_page(cls._tiers, lambda tier: tier.id, cursor, limit)
+        return await keyset_page(db, select(Tier), Tier.id, cursor, limit)
+
+    @classmethod
+    async def get_tier(cls, db: AsyncSession, tier_id: int) -> Optional[Tier]:
+        """Уровень доступа по ID"""
+        tier = cls._tiers_by_id.get(tier_id) if cls._loaded else None
+        if tier is None:
+            result = await db.execute(select(Tier).where(Tier.id == tier_id))
+            tier = result.scalar_one_or_none()
+        return tier
+
+    @classmethod
+    async def get_tier_by_name(cls, db: AsyncSession, name: str) -> Optional[Tier]:
+        """Уровень доступа по имени"""
+        tier = cls._tiers_by_name.get(name) if cls._loaded else None
+        if tier is None:
+            result = await db.execute(select(Tier).where(Tier.name == name))
+            tier = result.scalar_one_or_none()
+        return tier
@@ -1,6 +1,6 @@
 import uuid as uuid_pkg
 from datetime import datetime, UTC, timezone
-from typing import Any
+from typing import Any, Generic, Optional, TypeVar
 
 from pydantic import BaseModel, Field, field_serializer
 
@@ -20,6 +20,23 @@ class HealthCheck(BaseModel):
     description: str
 
 
+# -------------- Пагинация --------------
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    Схема страницы списка с курсорной пагинацией.
+
+    Атрибуты:
+    --- items (list): Элементы страницы.
+    --- next_cursor (str | None): Курсор следующей страницы, None - страница последняя.
+    """
+
+    items: list[T]
+    next_cursor: Optional[str] = None
+
+
 # -------------- Миксины --------------
 class UUIDSchema(BaseModel):
     """
@@ -0,0 +1,114 @@
+import asyncio
+import functools
+import inspect
+from enum import Enum
+from typing import Awaitable, Callable, Hashable, TypeVar
+from uuid import UUID
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache_decorator import user_scope_key
+from app.core.cache_metrics import cache_metrics
+from app.core.models.db_helper import db_helper
+
+T = TypeVar("T")
+
+# Типы параметров роута, из которых строится ключ запроса
+KEY_TYPES = (str, int, float, bool, UUID, Enum, type(None))
+
+# ========================
+# Объединение одинаковых запросов в воркере (single-flight)
+# ========================
+
+
+class SingleFlight:
+    """
+    Объединение одновременных одинаковых вызовов в воркере.
+
+    Первый вызов с ключом выполняет работу в отдельной задаче, остальные ждут
+    ее результат (или исключение). Отмена ожидающего (например, клиент закрыл
+    соединение) не отменяет работу для остальных. Результат нигде не хранится:
+    после завершения задачи следующий вызов выполняется заново.
+    """
+
+    def __init__(self, name: str):
+        self.name = name  # Имя группы для метрик
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Выполнить `fn` или дождаться уже выполняющегося вызова с тем же ключом"""
+        task = self._calls.get(key)
+        if task is None:
+            cache_metrics.inc(
+                "single_flight_calls_total", group=self.name, role="leader"
+            )
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(functools.partial(self._done, key))
+        else:
+            cache_metrics.inc(
+                "single_flight_calls_total", group=self.name, role="follower"
+            )
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Future) -> None:
+        self._calls.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # Ошибка уже передана ожидающим, если они остались
+
+
+def request_key(arguments: dict) -> tuple:
+    """
+    Нормализованный ключ запроса: скалярные параметры роута (путь и query).
+    Сессии БД, клиенты и прочие зависимости в ключ не входят; для Request
+    добавляется область пользователя, чтобы не смешивать ответы разных клиентов.
+    """
+    key = []
+    for name, value in sorted(arguments.items()):
+        if isinstance(value, Request):
+            key.append((name, user_scope_key(value)))
+        elif isinstance(value, KEY_TYPES):
+            key.append((name, value))
+    return tuple(key)
+
+
+def coalesce(func: Callable) -> Callable:
+    """
+    Объединять одновременные одинаковые вызовы асинхронного роута в воркере.
+
+    Ставится под `@router.get(...)` (и над `@cached`, чтобы одинаковые запросы
+    обращались к кэшу один раз). Ответ разделяется между ожидающими запросами,
+    поэтому подходит только для чтения.
+
+    Общая работа переживает запрос, который ее начал, поэтому сессии БД из его
+    зависимостей заменяются сессией, открытой и закрытой самой задачей.
+    """
+    flight = SingleFlight(func.__qualname__)
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        session_names = [
+            name
+            for name, value in bound.arguments.items()
+            if isinstance(value, AsyncSession)
+        ]
+
+        async def run():
+            if not session_names:
+                return await func(*bound.args, **bound.kwargs)
+            async with db_helper.session_factory() as session:
+                for name in session_names:
+                    bound.arguments[name] = session
+                return await func(*bound.args, **bound.kwargs)
+
+        return await flight.do(request_key(bound.arguments), run)
+
+    return wrapper
+
+
+# Группа для страниц меню ресторана (используется вне роутов)
+menu_flight = SingleFlight("restaurant_menu")
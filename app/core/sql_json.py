@@ -0,0 +1,20 @@
+from itertools import chain
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+# ========================
+# Сборка JSON в PostgreSQL
+# ========================
+
+
+def json_object(**fields):
+    """json_build_object из пар имя поля - SQL-выражение"""
+    return func.json_build_object(*chain.from_iterable(fields.items()))
+
+
+def json_array(element, order_by):
+    """JSON-массив элементов группы в заданном порядке ([] для пустой группы)"""
+    return func.coalesce(
+        func.json_agg(aggregate_order_by(element, order_by)), func.json_build_array()
+    )
@@ -9,7 +9,14 @@ from fastapi.openapi.docs import (
 )
 from fastapi_limiter import FastAPILimiter
 
+from app.api.restaurant_v1.restaurant_filter import RestaurantFilter
+from app.api.restaurant_v1.restaurant_prefetch import MenuPrefetcher
+from app.api.restaurant_v1.restaurant_warming import MenuCacheWarmer
+from app.core.cache_events import CacheEvents
+from app.core.cache_tags import CacheTagInvalidator
+from app.core.degraded_mode import register_degraded_mode
 from app.core.redis import RedisClient, get_settings
+from app.core.reference_data import ReferenceData
 from core.models import db_helper
 
 
@@ -32,12 +39,23 @@ async def lifespan(app: FastAPI):
     await RedisClient.init_pool(get_settings())
     rediska = await RedisClient.get_client(get_settings())
     await FastAPILimiter.init(rediska)
+    # Снимок справочников и фильтр UUID ресторанов обновляются по событиям кэша
+    await ReferenceData.start()
+    RestaurantFilter.start()
+    CacheEvents.start()
+    # Прогреваем кэш меню активных ресторанов в фоне
+    MenuCacheWarmer.start()
 
     yield
     # Остановка приложения
 
     print("Завершение приложения... stopping server... Done!  :D")
-    # Закрываем соединения при остановке
+    # Применяем отложенные инвалидации кэша и закрываем соединения при остановке
+    await MenuCacheWarmer.stop()
+    await MenuPrefetcher.stop()
+    await RestaurantFilter.stop()
+    await CacheEvents.stop()
+    await CacheTagInvalidator.flush()
     await RedisClient.close()
     await db_helper.dispose()  # Закрытие соединения с базой данных
 
@@ -133,6 +151,9 @@ def create_app(
         middleware=middleware,
     )  # Инициализация FastAPI
 
+    # При недоступной БД: 503 вместо 500, быстрый отказ записи, меню из Redis
+    register_degraded_mode(app)
+
     if create_custom_static_urls:
         register_static_docs_routes(
             app
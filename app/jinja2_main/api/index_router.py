@@ -3,9 +3,31 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Request, Depends, Query
-from fastapi.templating import Jinja2Templates
-from app.api.restaurant_v1.restaurant_router import get_restaurant_by_uuid_with_products
-from app.core.models.restaurant_model import Restaurant
+from fastapi.responses import HTMLResponse
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.api.restaurant_v1.restaurant_cache import (
+    STALE_FIELD,
+    get_restaurant_menu_cached,
+    page_cache_key,
+)
+from app.api.restaurant_v1.restaurant_filter import reject_unknown_restaurant
+from app.api.restaurant_v1.restaurant_prefetch import MenuPrefetcher
+from app.api.restaurant_v1.restaurant_slugs import resolve_restaurant_slug
+from app.api.restaurant_v1.restaurant_warming import record_menu_hit
+from app.core.cache_versions import get_restaurant_version
+from app.core.config import settings
+from app.core.http_cache import (
+    cache_headers,
+    etag_matches,
+    make_etag,
+    no_store_headers,
+    not_modified,
+    stale_headers,
+)
+from app.core.redis import get_redis
+from app.core.redis_utils import cache_get, cache_set
 from app.jinja2_main.jinja2_templates import templates
 
 logger = logging.getLogger(__name__)
@@ -14,126 +36,307 @@ router = APIRouter(
     tags=["Index"],
 )
 
+# Полная страница и ajax-фрагмент различаются по X-Requested-With
+PAGE_VARY = ("X-Requested-With", "Accept-Encoding")
+
+
+def is_ajax_request(request: Request) -> bool:
+    """Запрос частичной страницы (сетка продуктов и пагинация) из ajax-menu.js"""
+    return request.headers.get("X-Requested-With") == "XMLHttpRequest"
+
+
+async def build_menu_page(
+    request: Request,
+    redis: Redis,
+    template_name: str,
+    restaurant_uuid: UUID,
+    page: int,
+    page_size: int,
+    category_filter: Optional[str],
+    is_ajax: bool,
+    version: Optional[int],
+) -> tuple[str, dict]:
+    """Отрисовать страницу меню. Возвращает HTML и данные меню"""
+    restaurant = await get_restaurant_menu_cached(
+        redis=redis,
+        restaurant_uuid=restaurant_uuid,
+        page=page,
+        page_size=page_size,
+        category_filter=category_filter,
+        version=version,
+    )
+    context = {
+        "request": request,
+        "restaurant": restaurant.get("restaurant"),
+        "categories": restaurant.get("categories"),
+        "products": restaurant.get("products"),
+        "restaurant_uuid": restaurant_uuid,
+        "pagination": restaurant.get("pagination"),
+    }
+    if is_ajax:
+        # Возвращаем только HTML для сетки продуктов и пагинации
+        template_name = "includes/menu-section.html"
+    return templates.get_template(template_name).render(context), restaurant
+
+
+async def render_menu_page(
+    request: Request,
+    redis: Redis,
+    route: str,
+    template_name: str,
+    restaurant_uuid: UUID,
+    page: int,
+    page_size: int,
+    category_filter: Optional[str],
+) -> HTMLResponse:
+    """
+    Отрисовать страницу меню с кэшированием готового HTML.
+
+    HTML кэшируется под той же версией ресторана, что и данные меню, поэтому
+    устаревает вместе с ними. Анонимный запрос при попадании в кэш не обращается
+    ни к данным меню, ни к шаблонизатору. Хост входит в ключ, так как url_for
+    строит абсолютные URL.
+
+    Страница отдается с ETag по версии содержимого ресторана: повторный запрос
+    с актуальным If-None-Match получает 304 без обращения к кэшу страниц и БД.
+
+    Следующая страница при прокрутке строится и кэшируется заранее в фоне.
+
+    Страница из резервной копии меню (БД недоступна) не кэшируется и отдается
+    с заголовком Warning.
+    """
+    reject_unknown_restaurant(restaurant_uuid)
+    record_menu_hit(restaurant_uuid)
+    is_ajax = is_ajax_request(request)
+    # Персонализированные запросы не кэшируем
+    cacheable = "Authorization" not in request.headers
+
+    def cache_key(version: int, page: int = page, is_ajax: bool = is_ajax) -> str:
+        return page_cache_key(
+            route,
+            request.url.netloc,
+            restaurant_uuid,
+            version,
+            page,
+            page_size,
+            category_filter,
+            is_ajax,
+        )
+
+    def html_response(html: str, version: int) -> HTMLResponse:
+        return HTMLResponse(
+            html, headers=cache_headers(make_etag(cache_key(version)), PAGE_VARY)
+        )
+
+    def prefetch_next_page(version: int, total_pages: int) -> None:
+        # Следующую страницу прокрутка всегда запрашивает ajax-фрагментом
+        async def build(next_page: int) -> None:
+            key = cache_key(version, next_page, is_ajax=True)
+            if await cache_get(redis, key) is not None:
+                return
+            html, restaurant = await build_menu_page(
+                request,
+                redis,
+                template_name,
+                restaurant_uuid,
+                next_page,
+                page_size,
+                category_filter,
+                True,
+                version,
+            )
+            if restaurant.get(STALE_FIELD):
+                return
+            await cache_set(
+                redis=redis,
+                key=key,
+                value={"html": html, "total_pages": total_pages},
+                expire=settings.cache.menu_ttl,
+            )
+
+        if cacheable:
+            MenuPrefetcher.schedule_next_page(
+                key=cache_key(version, page + 1, is_ajax=True),
+                restaurant_uuid=restaurant_uuid,
+                page=page,
+                page_size=page_size,
+                category_filter=category_filter,
+                total_pages=total_pages,
+                build=build,
+                is_ajax=is_ajax,
+            )
+
+    try:
+        version = await get_restaurant_version(redis, restaurant_uuid)
+    except RedisError:
+        version = None  # Версия неизвестна: страница строится из БД без кэша
+    if version is not None:
+        etag = make_etag(cache_key(version))
+        if etag_matches(request, etag):
+            return not_modified(etag, PAGE_VARY)
+
+        if cacheable:
+            cached = await cache_get(redis, cache_key(version))
+            if isinstance(cached, dict):
+                prefetch_next_page(version, cached["total_pages"])
+                return html_response(cached["html"], version)
+
+    html, restaurant = await build_menu_page(
+        request,
+        redis,
+        template_name,
+        restaurant_uuid,
+        page,
+        page_size,
+        category_filter,
+        is_ajax,
+        version,
+    )
+    if restaurant.get(STALE_FIELD):
+        return HTMLResponse(html, headers=stale_headers(PAGE_VARY))
+    if restaurant["version"] is None:
+        return HTMLResponse(html, headers=no_store_headers(PAGE_VARY))
+
+    version = restaurant["version"]
+    total_pages = restaurant["pagination"]["total_pages"]
+
+    if cacheable:
+        await cache_set(
+            redis=redis,
+            key=cache_key(version),
+            value={"html": html, "total_pages": total_pages},
+            expire=settings.cache.menu_ttl,
+        )
+    prefetch_next_page(version, total_pages)
+    return html_response(html, version)
+
 
 @router.get("/")
 async def index_page(
     request: Request,
-    restaurant_uuid: Optional[UUID | str] = Query(None),  # Параметр из строки запроса
-    restaurant: dict = Depends(get_restaurant_by_uuid_with_products),
+    restaurant_uuid: UUID = Query(..., description="UUID ресторана"),
+    page: int = Query(1, ge=1, description="Номер страницы"),
+    page_size: int = Query(
+        settings.menu.default_page_size,
+        ge=1,
+        le=settings.menu.max_page_size,
+        description="Размер страницы",
+    ),
+    category_filter: Optional[str] = Query(None, description="Фильтр по категории"),
+    redis: Redis = Depends(get_redis),
 ):
-    print(f"Request headers: {request.headers}")
-    print(f"Is AJAX: {request.headers.get('X-Requested-With') == 'XMLHttpRequest'}")
-    restaurant_db: dict | Restaurant = restaurant.get("restaurant")
-    categories: list = restaurant.get("categories")
-    products: list = restaurant.get("products")
-    pagination: dict = restaurant.get("pagination")
-
-    if isinstance(restaurant_db, Restaurant):  # Если это модель
-        restaurant_uuid = restaurant_db.uuid
-    elif isinstance(restaurant_db, dict):  # Если это словарь
-        restaurant_uuid = restaurant_db.get("uuid", None)
-    if request.headers.get("X-Requested-With") == "XMLHttpRequest":
-        # Возвращаем только HTML для сетки продуктов и пагинации
-        return templates.TemplateResponse(
-            "includes/menu-section.html",
-            {
-                "request": request,
-                "products": products,
-                "pagination": pagination,
-                "categories": categories,
-                "restaurant_uuid": restaurant_uuid,
-            },
-        )
+    return await render_menu_page(
+        request=request,
+        redis=redis,
+        route="index",
+        template_name="index.html",
+        restaurant_uuid=restaurant_uuid,
+        page=page,
+        page_size=page_size,
+        category_filter=category_filter,
+    )
+
 
-    return templates.TemplateResponse(
-        name="index.html",
-        context={
-            "request": request,
-            "restaurant": restaurant_db,
-            "categories": categories,
-            "products": products,
-            "restaurant_uuid": restaurant_uuid,
-            "pagination": restaurant.get("pagination"),
-        },
+@router.get("/r/{slug}")
+async def slug_page(
+    request: Request,
+    slug: str,
+    page: int = Query(1, ge=1, description="Номер страницы"),
+    page_size: int = Query(
+        settings.menu.default_page_size,
+        ge=1,
+        le=settings.menu.max_page_size,
+        description="Размер страницы",
+    ),
+    category_filter: Optional[str] = Query(None, description="Фильтр по категории"),
+    redis: Redis = Depends(get_redis),
+):
+    """Страница меню ресторана по slug"""
+    return await render_menu_page(
+        request=request,
+        redis=redis,
+        route="slug",
+        template_name="index.html",
+        restaurant_uuid=await resolve_restaurant_slug(redis, slug),
+        page=page,
+        page_size=page_size,
+        category_filter=category_filter,
     )
 
 
 @router.get("/menu/")
 async def menu_page(
     request: Request,
-    restaurant_uuid: Optional[UUID | str] = Query(None),  # Параметр из строки запроса
-    restaurant: dict = Depends(get_restaurant_by_uuid_with_products),
+    restaurant_uuid: UUID = Query(..., description="UUID ресторана"),
+    page: int = Query(1, ge=1, description="Номер страницы"),
+    page_size: int = Query(
+        settings.menu.default_page_size,
+        ge=1,
+        le=settings.menu.max_page_size,
+        description="Размер страницы",
+    ),
+    category_filter: Optional[str] = Query(None, description="Фильтр по категории"),
+    redis: Redis = Depends(get_redis),
 ):
-    restaurant_db: dict | Restaurant = restaurant.get("restaurant")
-    categories: list = restaurant.get("categories")
-    products: list = restaurant.get("products")
-    if isinstance(restaurant_db, Restaurant):  # Если это модель
-        restaurant_uuid = restaurant_db.uuid
-    elif isinstance(restaurant_db, dict):  # Если это словарь
-        restaurant_uuid = restaurant_db.get("uuid", None)
-
-    return templates.TemplateResponse(
-        name="menu.html",
-        context={
-            "request": request,
-            "restaurant": restaurant_db,
-            "categories": categories,
-            "products": products,
-            "restaurant_uuid": restaurant_uuid,
-            "pagination": restaurant.get("pagination"),
-        },
+    return await render_menu_page(
+        request=request,
+        redis=redis,
+        route="menu",
+        template_name="menu.html",
+        restaurant_uuid=restaurant_uuid,
+        page=page,
+        page_size=page_size,
+        category_filter=category_filter,
     )
 
 
 @router.get("/menu/")
 async def about_page(
     request: Request,
-    restaurant_uuid: Optional[UUID | str] = Query(None),  # Параметр из строки запроса
-    restaurant: dict = Depends(get_restaurant_by_uuid_with_products),
+    restaurant_uuid: UUID = Query(..., description="UUID ресторана"),
+    page: int = Query(1, ge=1, description="Номер страницы"),
+    page_size: int = Query(
+        settings.menu.default_page_size,
+        ge=1,
+        le=settings.menu.max_page_size,
+        description="Размер страницы",
+    ),
+    category_filter: Optional[str] = Query(None, description="Фильтр по категории"),
+    redis: Redis = Depends(get_redis),
 ):
-    restaurant_db: dict | Restaurant = restaurant.get("restaurant")
-    categories: list = restaurant.get("categories")
-    products: list = restaurant.get("products")
-    if isinstance(restaurant_db, Restaurant):  # Если это модель
-        restaurant_uuid = restaurant_db.uuid
-    elif isinstance(restaurant_db, dict):  # Если это словарь
-        restaurant_uuid = restaurant_db.get("uuid", None)
-
-    return templates.TemplateResponse(
-        name="menu.html",
-        context={
-            "request": request,
-            "restaurant": restaurant_db,
-            "categories": categories,
-            "products": products,
-            "restaurant_uuid": restaurant_uuid,
-            "pagination": restaurant.get("pagination"),
-        },
+    return await render_menu_page(
+        request=request,
+        redis=redis,
+        route="about",
+        template_name="menu.html",
+        restaurant_uuid=restaurant_uuid,
+        page=page,
+        page_size=page_size,
+        category_filter=category_filter,
     )
 
 
 @router.get("/menu/")
 async def contact_page(
     request: Request,
-    restaurant_uuid: Optional[UUID | str] = Query(None),  # Параметр из строки запроса
-    restaurant: dict = Depends(get_restaurant_by_uuid_with_products),
+    restaurant_uuid: UUID = Query(..., description="UUID ресторана"),
+    page: int = Query(1, ge=1, description="Номер страницы"),
+    page_size: int = Query(
+        settings.menu.default_page_size,
+        ge=1,
+        le=settings.menu.max_page_size,
+        description="Размер страницы",
+    ),
+    category_filter: Optional[str] = Query(None, description="Фильтр по категории"),
+    redis: Redis = Depends(get_redis),
 ):
-    restaurant_db: dict | Restaurant = restaurant.get("restaurant")
-    categories: list = restaurant.get("categories")
-    products: list = restaurant.get("products")
-    if isinstance(restaurant_db, Restaurant):  # Если это модель
-        restaurant_uuid = restaurant_db.uuid
-    elif isinstance(restaurant_db, dict):  # Если это словарь
-        restaurant_uuid = restaurant_db.get("uuid", None)
-
-    return templates.TemplateResponse(
-        name="menu.html",
-        context={
-            "request": request,
-            "restaurant": restaurant_db,
-            "categories": categories,
-            "products": products,
-            "restaurant_uuid": restaurant_uuid,
-            "pagination": restaurant.get("pagination"),
-        },
+    return await render_menu_page(
+        request=request,
+        redis=redis,
+        route="contact",
+        template_name="menu.html",
+        restaurant_uuid=restaurant_uuid,
+        page=page,
+        page_size=page_size,
+        category_filter=category_filter,
     )